@@ -1,12 +1,15 @@
 from django.contrib import admin
-from .models import UserProfile
+
+from sex_education_system.admin_mixins import AnnotatedAdminMixin, annotated_column
+from .models import UserLearningStats, UserProfile
 
 
 @admin.register(UserProfile)
-class UserProfileAdmin(admin.ModelAdmin):
+class UserProfileAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     """Admin interface for UserProfile"""
     list_display = ('user', 'date_of_birth', 'created_at', 'completed_courses', 'quiz_attempts')
     list_filter = ('created_at',)
+    list_select_related = ('user',)
     search_fields = ('user__username', 'user__email', 'user__first_name', 'user__last_name')
     readonly_fields = ('created_at', 'updated_at')
     
@@ -22,3 +25,18 @@ class UserProfileAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+    completed_courses = annotated_column('num_completed_courses', 'Completed courses')
+    quiz_attempts = annotated_column('num_quiz_attempts', 'Quiz attempts')
+
+    def annotate_queryset(self, queryset):
+        return queryset.with_stats()
+
+
+@admin.register(UserLearningStats)
+class UserLearningStatsAdmin(admin.ModelAdmin):
+    """Admin interface for UserLearningStats"""
+    list_display = ('user', 'courses_started', 'courses_completed', 'total_attempts', 'mean_score', 'best_score', 'last_activity_at')
+    search_fields = ('user__username',)
+    readonly_fields = ('updated_at',)
+    list_select_related = ('user',)
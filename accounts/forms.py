@@ -100,10 +100,14 @@ class UserProfileForm(forms.ModelForm):
         profile = super().save(commit=False)
         if commit:
             profile.save()
-            # Update user fields
+            # Update user fields, writing the user only if one of them changed
             user = profile.user
-            user.first_name = self.cleaned_data.get('first_name', '')
-            user.last_name = self.cleaned_data.get('last_name', '')
-            user.email = self.cleaned_data.get('email', '')
-            user.save()
+            changed = []
+            for field in ('first_name', 'last_name', 'email'):
+                value = self.cleaned_data.get(field, '')
+                if getattr(user, field) != value:
+                    setattr(user, field, value)
+                    changed.append(field)
+            if changed:
+                user.save(update_fields=changed)
         return profile
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserLearningStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='learning_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('courses_started', models.PositiveIntegerField(default=0)),
+                ('courses_completed', models.PositiveIntegerField(default=0)),
+                ('total_attempts', models.PositiveIntegerField(default=0)),
+                ('score_total', models.FloatField(default=0.0)),
+                ('best_score', models.FloatField(default=0.0)),
+                ('last_activity_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'User learning stats',
+            },
+        ),
+    ]
@@ -1,7 +1,40 @@
-from django.db import models
+import threading
+import weakref
+
+from django.db import models, transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, Greatest
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
 from django.dispatch import receiver
+from django.utils import timezone
+
+from sex_education_system.images import AVATAR_WIDTHS, delete_variants, schedule_refresh_variants
+
+
+def _count_per_user(queryset):
+    """Correlated COUNT of ``queryset`` rows belonging to the outer row's user"""
+    counts = (
+        queryset.filter(user=OuterRef('user'))
+        .order_by()
+        .values('user')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+class UserProfileQuerySet(models.QuerySet):
+    """QuerySet helpers for profile listings"""
+
+    def with_stats(self):
+        """Annotate completed course and quiz attempt counts in the same SELECT"""
+        from courses.models import UserCourseProgress
+        from quizzes.models import UserQuizAttempt
+        return self.annotate(
+            num_completed_courses=_count_per_user(UserCourseProgress.objects.filter(completed=True)),
+            num_quiz_attempts=_count_per_user(UserQuizAttempt.objects.all()),
+        )
 
 
 class UserProfile(models.Model):
@@ -10,15 +43,55 @@ class UserProfile(models.Model):
     bio = models.TextField(max_length=500, blank=True)
     date_of_birth = models.DateField(null=True, blank=True)
     profile_picture = models.ImageField(upload_to='profiles/', null=True, blank=True)
+    # Resized WebP/JPEG copies of the picture (see sex_education_system.images)
+    profile_picture_variants = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = UserProfileQuerySet.as_manager()
+    
     def __str__(self):
         return f"{self.user.username}'s Profile"
     
+    @classmethod
+    def for_user(cls, user):
+        """Fetch the user's profile, creating it on first use"""
+        try:
+            return user.profile
+        except cls.DoesNotExist:
+            profile, created = cls.objects.get_or_create(user=user)
+            user.profile = profile
+            return profile
+    
+    def tracked_values(self):
+        """Current values of the loaded, editable fields (files compare by name)"""
+        values = {}
+        for field in self._meta.concrete_fields:
+            if field.editable and field.attname in self.__dict__:
+                value = self.__dict__[field.attname]
+                values[field.attname] = getattr(value, 'name', value)
+        return values
+    
+    def changed_fields(self):
+        """Fields modified since the profile was loaded or last saved"""
+        loaded = self._loaded_values
+        return [name for name, value in self.tracked_values().items() if name not in loaded or loaded[name] != value]
+    
+    def save(self, *args, **kwargs):
+        """Write only the changed fields; an unchanged profile is not saved at all"""
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            changed = self.changed_fields()
+            if not changed:
+                return
+            kwargs['update_fields'] = [*changed, 'updated_at']
+        super().save(*args, **kwargs)
+        self._loaded_values = self.tracked_values()
+    
     @property
     def completed_courses(self):
         """Count of completed courses"""
+        if hasattr(self, 'num_completed_courses'):
+            return self.num_completed_courses
         try:
             from courses.models import UserCourseProgress
             return UserCourseProgress.objects.filter(user=self.user, completed=True).count()
@@ -28,6 +101,8 @@ class UserProfile(models.Model):
     @property
     def quiz_attempts(self):
         """Count of quiz attempts"""
+        if hasattr(self, 'num_quiz_attempts'):
+            return self.num_quiz_attempts
         try:
             from quizzes.models import UserQuizAttempt
             return UserQuizAttempt.objects.filter(user=self.user).count()
@@ -35,14 +110,175 @@ class UserProfile(models.Model):
             return 0
 
 
-@receiver(post_save, sender=User)
-def create_user_profile(sender, instance, created, **kwargs):
-    """Automatically create UserProfile when User is created"""
+class UserLearningStats(models.Model):
+    """Per-user learning summary, maintained incrementally for the dashboard"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='learning_stats')
+    courses_started = models.PositiveIntegerField(default=0)
+    courses_completed = models.PositiveIntegerField(default=0)
+    total_attempts = models.PositiveIntegerField(default=0)
+    score_total = models.FloatField(default=0.0)
+    best_score = models.FloatField(default=0.0)
+    last_activity_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name_plural = 'User learning stats'
+    
+    def __str__(self):
+        return f"{self.user.username}'s Learning Stats"
+    
+    @property
+    def mean_score(self):
+        """Average quiz score across every attempt"""
+        if self.total_attempts == 0:
+            return 0
+        return round(self.score_total / self.total_attempts, 1)
+    
+    @classmethod
+    def for_user(cls, user):
+        """Fetch the stats row, building it from the full history if it is missing"""
+        try:
+            return cls.objects.get(pk=user.pk)
+        except cls.DoesNotExist:
+            return cls.rebuild(user.pk)
+    
+    @classmethod
+    def rebuild(cls, user_id):
+        """Recompute a user's stats from their complete progress and attempt history"""
+        from courses.models import UserCourseProgress
+        from quizzes.models import UserQuizAttempt
+        
+        progress = UserCourseProgress.objects.filter(user_id=user_id).aggregate(
+            started=Count('pk'),
+            completed=Count('pk', filter=Q(completed=True)),
+            last_started=Max('started_at'),
+            last_completed=Max('completed_at'),
+        )
+        attempts = UserQuizAttempt.objects.filter(user_id=user_id).aggregate(
+            total=Count('pk'),
+            score_total=Sum('score'),
+            best=Max('score'),
+            last_attempted=Max('attempted_at'),
+        )
+        activity = [
+            moment for moment in (progress['last_started'], progress['last_completed'], attempts['last_attempted'])
+            if moment is not None
+        ]
+        stats, created = cls.objects.update_or_create(
+            user_id=user_id,
+            defaults={
+                'courses_started': progress['started'],
+                'courses_completed': progress['completed'],
+                'total_attempts': attempts['total'],
+                'score_total': attempts['score_total'] or 0.0,
+                'best_score': attempts['best'] or 0.0,
+                'last_activity_at': max(activity) if activity else None,
+            },
+        )
+        return stats
+
+
+# This thread's not yet committed rebuild per database alias. Only the on_commit queue holds
+# the callback strongly, so a rollback discarding it also removes it from here.
+_pending_rebuilds = threading.local()
+
+
+def _pending_rebuild_callbacks():
+    if not hasattr(_pending_rebuilds, 'callbacks'):
+        _pending_rebuilds.callbacks = weakref.WeakValueDictionary()
+    return _pending_rebuilds.callbacks
+
+
+class _PendingStatsRebuilds:
+    """on_commit callback rebuilding every collected user's stats once"""
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.user_ids = set()
+
+    def __call__(self):
+        # Rows changed from here on belong to the next transaction
+        callbacks = _pending_rebuild_callbacks()
+        if callbacks.get(self.alias) is self:
+            del callbacks[self.alias]
+        built = UserLearningStats.objects.filter(pk__in=self.user_ids).values_list('pk', flat=True)
+        for user_id in built:
+            UserLearningStats.rebuild(user_id)
+
+
+def schedule_stats_rebuild(user_id):
+    """Rebuild a user's stats when the current transaction commits, once however many rows changed"""
+    alias = transaction.get_connection().alias
+    callbacks = _pending_rebuild_callbacks()
+    callback = callbacks.get(alias)
+    if callback is not None:
+        callback.user_ids.add(user_id)
+        return
+    callback = callbacks[alias] = _PendingStatsRebuilds(alias)
+    callback.user_ids.add(user_id)
+    transaction.on_commit(callback)
+
+
+def record_learning_activity(user_id, **changes):
+    """Apply incremental changes to a user's stats row, if it has been built yet"""
+    UserLearningStats.objects.filter(pk=user_id).update(last_activity_at=timezone.now(), **changes)
+
+
+@receiver(post_save, sender='quizzes.UserQuizAttempt')
+def update_stats_for_attempt(sender, instance, created, **kwargs):
     if created:
-        UserProfile.objects.create(user=instance)
+        record_learning_activity(
+            instance.user_id,
+            total_attempts=F('total_attempts') + 1,
+            score_total=F('score_total') + instance.score,
+            best_score=Greatest('best_score', models.Value(instance.score)),
+        )
+
+
+@receiver(post_init, sender='courses.UserCourseProgress')
+def remember_progress_completion(sender, instance, **kwargs):
+    instance._completed_at_load = instance.completed
+
+
+@receiver(post_save, sender='courses.UserCourseProgress')
+def update_stats_for_progress(sender, instance, created, **kwargs):
+    changes = {}
+    if created:
+        changes['courses_started'] = F('courses_started') + 1
+    if instance.completed != instance._completed_at_load:
+        delta = 1 if instance.completed else -1
+        changes['courses_completed'] = F('courses_completed') + delta
+    instance._completed_at_load = instance.completed
+    if changes:
+        record_learning_activity(instance.user_id, **changes)
+
+
+@receiver(m2m_changed, sender='courses.UserCourseProgress_completed_lessons')
+def update_stats_for_lesson(sender, instance, action, reverse, **kwargs):
+    if action == 'post_add' and not reverse:
+        record_learning_activity(instance.user_id)
+
+
+@receiver(post_delete, sender='quizzes.UserQuizAttempt')
+@receiver(post_delete, sender='courses.UserCourseProgress')
+def rebuild_stats_after_delete(sender, instance, **kwargs):
+    """Removed history cannot be subtracted incrementally, so recount it"""
+    # A cascade (deleting a course or quiz) removes many rows; each user is rebuilt once
+    schedule_stats_rebuild(instance.user_id)
+
+
+@receiver(post_init, sender=UserProfile)
+def remember_profile_fields(sender, instance, **kwargs):
+    instance._loaded_values = instance.tracked_values()
+
+
+@receiver(post_save, sender=UserProfile)
+def build_profile_picture_variants(sender, instance, **kwargs):
+    """Generate responsive variants when a new profile picture is uploaded"""
+    schedule_refresh_variants(instance, 'profile_picture', 'profile_picture_variants', AVATAR_WIDTHS)
+
 
+@receiver(post_delete, sender=UserProfile)
+def delete_profile_picture_variants(sender, instance, **kwargs):
+    delete_variants(instance.profile_picture.storage, instance.profile_picture_variants)
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    """Save UserProfile when User is saved"""
-    instance.profile.save()
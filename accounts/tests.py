@@ -1,3 +1,79 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from content_management.synthetic import seed_dataset
+from quizzes.models import Quiz, UserQuizAttempt
+
+from .models import UserLearningStats
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'accounts-tests'}},
+    STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+    SECURE_SSL_REDIRECT=False,
+)
+class ChangelistQueryTests(TestCase):
+    """Changelist columns are loaded with the page, so the query count does not grow with the rows shown"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(users=12, courses=3, lessons=2, quizzes=3, questions=2, prefix='accounts-tests')
+        cls.admin = User.objects.create_superuser('accounts_admin', 'admin@example.com', 'pw')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def assert_changelist_queries(self, url_name, num, ordering=None):
+        with self.assertNumQueries(num):
+            response = self.client.get(reverse(url_name), {'o': ordering} if ordering else {})
+        self.assertEqual(response.status_code, 200)
+
+    def test_user_profile_changelist(self):
+        self.assert_changelist_queries('admin:accounts_userprofile_changelist', 5)
+
+    def test_user_profile_changelist_sorted_by_annotation(self):
+        # Column 5 is quiz_attempts
+        self.assert_changelist_queries('admin:accounts_userprofile_changelist', 5, ordering='5')
+
+    def test_user_learning_stats_changelist(self):
+        self.assert_changelist_queries('admin:accounts_userlearningstats_changelist', 5)
+
+
+class StatsRebuildTests(TestCase):
+    """Deleted history is recounted once per user when the transaction commits"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(users=4, courses=2, lessons=2, quizzes=2, questions=2, prefix='rebuild-tests')
+
+    def test_cascade_schedules_one_rebuild(self):
+        quiz = Quiz.objects.filter(attempts__isnull=False).first()
+        users = set(quiz.attempts.values_list('user_id', flat=True))
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            quiz.delete()
+        self.assertEqual(len(callbacks), 1)
+        for user_id in users:
+            self.assertEqual(
+                UserLearningStats.objects.get(pk=user_id).total_attempts,
+                UserQuizAttempt.objects.filter(user_id=user_id).count(),
+            )
+
+    def test_rolled_back_savepoint_does_not_swallow_later_rebuilds(self):
+        first, second = UserQuizAttempt.objects.all()[:2]
+        with self.captureOnCommitCallbacks() as callbacks:
+            try:
+                with transaction.atomic():
+                    first.delete()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            second.delete()
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(callbacks[0].user_ids, {second.user_id})
@@ -3,6 +3,7 @@ from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from .forms import UserRegistrationForm, UserLoginForm, UserProfileForm
+from .models import UserLearningStats, UserProfile
 from courses.models import UserCourseProgress
 from quizzes.models import UserQuizAttempt
 
@@ -61,14 +62,15 @@ def logout_view(request):
 @login_required
 def profile_view(request):
     """View and edit user profile"""
+    profile = UserProfile.for_user(request.user)
     if request.method == 'POST':
-        form = UserProfileForm(request.POST, request.FILES, instance=request.user.profile)
+        form = UserProfileForm(request.POST, request.FILES, instance=profile)
         if form.is_valid():
             form.save()
             messages.success(request, 'Your profile has been updated!')
             return redirect('accounts:profile')
     else:
-        form = UserProfileForm(instance=request.user.profile)
+        form = UserProfileForm(instance=profile)
     
     return render(request, 'pages/profile.html', {'form': form})
 
@@ -78,28 +80,22 @@ def dashboard_view(request):
     """User dashboard with progress overview"""
     user = request.user
     
+    # Header statistics come from the materialized per-user summary row
+    stats = UserLearningStats.for_user(user)
+    
     # Get user progress
     course_progress = UserCourseProgress.objects.filter(user=user).select_related('course')
     quiz_attempts = UserQuizAttempt.objects.filter(user=user).select_related('quiz').order_by('-attempted_at')[:5]
     
-    # Calculate statistics
-    total_courses = course_progress.count()
-    completed_courses = course_progress.filter(completed=True).count()
-    total_quizzes = quiz_attempts.count()
-    
-    # Calculate average quiz score
-    if total_quizzes > 0:
-        avg_score = sum(attempt.score for attempt in quiz_attempts) / total_quizzes
-    else:
-        avg_score = 0
-    
     context = {
         'course_progress': course_progress,
         'quiz_attempts': quiz_attempts,
-        'total_courses': total_courses,
-        'completed_courses': completed_courses,
-        'total_quizzes': total_quizzes,
-        'avg_score': round(avg_score, 1),
+        'total_courses': stats.courses_started,
+        'completed_courses': stats.courses_completed,
+        'total_quizzes': stats.total_attempts,
+        'avg_score': stats.mean_score,
+        'best_score': stats.best_score,
+        'last_activity_at': stats.last_activity_at,
     }
     
     return render(request, 'pages/dashboard.html', context)
@@ -5,7 +5,9 @@ set -o errexit
 # Install dependencies
 pip install -r requirements.txt
 
-# Collect static files
+# Build the minified CSS bundle with self-hosted fonts, then collect (and hash) static files.
+# Without access to Google Fonts the build goes on and the pages link Google's stylesheet.
+python manage.py build_assets --fetch-fonts || python manage.py build_assets
 python manage.py collectstatic --no-input
 
 # Run migrations
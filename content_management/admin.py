@@ -1,3 +1,10 @@
 from django.contrib import admin
+from .models import PlatformStatsSnapshot
 
-# Register your models here.
+
+@admin.register(PlatformStatsSnapshot)
+class PlatformStatsSnapshotAdmin(admin.ModelAdmin):
+    """Admin interface for PlatformStatsSnapshot"""
+    list_display = ('captured_at', 'total_users', 'total_courses', 'total_lessons', 'total_quizzes', 'total_questions', 'estimated')
+    date_hierarchy = 'captured_at'
+    readonly_fields = ('captured_at', 'total_users', 'total_courses', 'total_lessons', 'total_quizzes', 'total_questions', 'deltas', 'estimated')
@@ -0,0 +1,230 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from accounts.models import UserProfile
+from courses.models import Course, UserCourseProgress
+from quizzes.models import Quiz, UserQuizAttempt
+from sex_education_system.instrumentation import collect
+
+
+BENCHMARK_NAMESPACES = ('courses', 'quizzes', 'accounts')
+ROLES = ('anonymous', 'student', 'staff')
+
+# A route regresses when its p95 grows by more than this fraction and this many milliseconds
+REGRESSION_TOLERANCE = 0.25
+REGRESSION_MIN_DELTA_MS = 2.0
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a sorted list of samples"""
+    if not samples:
+        return 0.0
+    index = max(0, min(len(samples) - 1, round(pct / 100 * len(samples)) - 1))
+    return samples[index]
+
+
+def named_routes(namespaces=BENCHMARK_NAMESPACES):
+    """Yield (route name, parameter names) for every named URL in the given namespaces"""
+    for resolver in get_resolver().url_patterns:
+        if not isinstance(resolver, URLResolver) or resolver.namespace not in namespaces:
+            continue
+        for pattern in resolver.url_patterns:
+            if isinstance(pattern, URLPattern) and pattern.name:
+                yield f'{resolver.namespace}:{pattern.name}', list(pattern.pattern.converters)
+
+
+class Fixtures:
+    """Benchmark accounts and the objects used to fill in URL parameters"""
+
+    def __init__(self):
+        self.users = {
+            'anonymous': None,
+            'student': User.objects.create_user('bench_student', 'bench_student@example.com'),
+            'staff': User.objects.create_user('bench_staff', 'bench_staff@example.com', is_staff=True),
+        }
+        # Profiles are created lazily; give the accounts one, like any user who has visited their profile
+        UserProfile.objects.bulk_create(UserProfile(user=user) for user in self.users.values() if user)
+        self.course = Course.objects.filter(is_published=True, is_archived=False, lessons__isnull=False).first()
+        self.lesson = self.course.lessons.order_by('order')[1]
+        quizzes = Quiz.objects.filter(is_active=True, questions__answers__isnull=False).distinct()
+        # Only one attempt per quiz is allowed, so taking a quiz uses one the accounts have not attempted
+        self.quiz, self.unattempted_quiz = quizzes[:2]
+        self.question = self.quiz.questions.first()
+        self.answer = self.question.answers.first()
+        self.archived_course = Course.objects.create(
+            title='Archived benchmark course', description='Archived', is_archived=True,
+        )
+        self.archived_quiz = Quiz.objects.create(
+            title='Archived benchmark quiz', description='Archived', is_active=False,
+        )
+
+        self.attempts = {}
+        for role, user in self.users.items():
+            if user is None:
+                continue
+            progress = UserCourseProgress.objects.create(user=user, course=self.course)
+            progress.completed_lessons.add(self.lesson)
+            self.attempts[role] = UserQuizAttempt.objects.create(user=user, quiz=self.quiz, score=50)
+
+    def submission(self):
+        """Form data answering every question of the benchmark quiz"""
+        return {
+            f'question_{question.pk}': question.answers.all()[0].pk
+            for question in self.unattempted_quiz.questions.prefetch_related('answers')
+        }
+
+    def kwargs_for(self, route, params, role):
+        """URL keyword arguments for a route, as seen by the given role"""
+        fixed = {
+            'quizzes:take': {'quiz_id': self.unattempted_quiz.pk},
+            'quizzes:submit': {'quiz_id': self.unattempted_quiz.pk},
+            'courses:restore': {'course_id': self.archived_course.pk},
+            'quizzes:restore_quiz': {'quiz_id': self.archived_quiz.pk},
+            'quizzes:delete_permanent': {'quiz_id': self.archived_quiz.pk},
+        }
+        if route in fixed:
+            return fixed[route]
+        attempt = self.attempts.get(role) or self.attempts['student']
+        values = {
+            'course_id': self.course.pk,
+            'lesson_id': self.lesson.pk,
+            'quiz_id': self.quiz.pk,
+            'question_id': self.question.pk,
+            'answer_id': self.answer.pk,
+            'attempt_id': attempt.pk,
+        }
+        return {param: values[param] for param in params}
+
+
+def measure(client, user, method, url, data, iterations):
+    """Time one route; the first request is recorded separately as the cold run"""
+    samples = []
+    for _ in range(iterations + 1):
+        if user is not None:
+            client.force_login(user)
+        # Every request is rolled back so state-changing routes measure the same work each time
+        with transaction.atomic():
+            with collect() as profile:
+                started = time.perf_counter()
+                response = getattr(client, method.lower())(url, data)
+                elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+        samples.append((elapsed, profile, response.status_code))
+
+    cold, warm = samples[0], samples[1:]
+    wall = sorted(elapsed * 1000 for elapsed, profile, status in warm)
+    return {
+        'url': url,
+        'method': method,
+        'status': warm[-1][2],
+        'queries_cold': cold[1].queries,
+        'queries': max(profile.queries for elapsed, profile, status in warm),
+        'sql_ms': round(statistics.median(profile.sql_time * 1000 for elapsed, profile, status in warm), 3),
+        'template_ms': round(statistics.median(profile.template_time * 1000 for elapsed, profile, status in warm), 3),
+        'cold_ms': round(cold[0] * 1000, 3),
+        'p50_ms': round(percentile(wall, 50), 3),
+        'p95_ms': round(percentile(wall, 95), 3),
+        'p99_ms': round(percentile(wall, 99), 3),
+    }
+
+
+def run_benchmark(roles=('student', 'staff'), iterations=20, namespaces=BENCHMARK_NAMESPACES):
+    """Drive every named route through the test client and return per-view measurements"""
+    fixtures = Fixtures()
+    scenarios = [(route, params, 'GET', None) for route, params in named_routes(namespaces)]
+    scenarios.append(('quizzes:submit', ['quiz_id'], 'POST', fixtures.submission()))
+
+    results = {}
+    for role in roles:
+        client = Client(raise_request_exception=False)
+        for route, params, method, data in scenarios:
+            url = reverse(route, kwargs=fixtures.kwargs_for(route, params, role))
+            key = f'{role} {method} {route}'
+            results[key] = measure(client, fixtures.users[role], method, url, data, iterations)
+    return results
+
+
+# A visit from login to logout: (step, method, route)
+SESSION_FLOW = [
+    ('login', 'POST', 'accounts:login'),
+    ('dashboard', 'GET', 'accounts:dashboard'),
+    ('course list', 'GET', 'courses:list'),
+    ('lesson', 'GET', 'courses:lesson'),
+    ('mark complete', 'GET', 'courses:mark_complete'),
+    ('lesson + message', 'GET', 'courses:lesson'),
+    ('logout', 'GET', 'accounts:logout'),
+]
+
+
+class SessionQueries:
+    """Counts queries against the session table, split into reads and writes"""
+
+    def __init__(self):
+        self.reads = 0
+        self.writes = 0
+        self.other = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if 'django_session' not in sql:
+            self.other += 1
+        elif sql.lstrip().upper().startswith('SELECT'):
+            self.reads += 1
+        else:
+            self.writes += 1
+        return execute(sql, params, many, context)
+
+
+def run_session_benchmark(setups, iterations=5):
+    """Walk SESSION_FLOW under each (session store, message storage) setup and return the queries each step made"""
+    password = 'bench-sessions'
+    user = User.objects.create_user('bench_sessions', 'bench_sessions@example.com', password)
+    lesson = Course.objects.filter(is_published=True, is_archived=False, lessons__isnull=False).first().lessons.first()
+    urls = {
+        'accounts:login': (reverse('accounts:login'), {'username': user.username, 'password': password}),
+        'courses:lesson': (reverse('courses:lesson', args=[lesson.course_id, lesson.pk]), None),
+        'courses:mark_complete': (reverse('courses:mark_complete', args=[lesson.course_id, lesson.pk]), None),
+    }
+
+    results = {}
+    for engine, message_storage in setups:
+        steps = {step: {'status': None, 'session_reads': 0, 'session_writes': 0, 'other': 0} for step, _, _ in SESSION_FLOW}
+        with override_settings(SESSION_ENGINE=settings.SESSION_ENGINES[engine], MESSAGE_STORAGE=message_storage):
+            for _ in range(iterations):
+                client = Client(raise_request_exception=False)
+                with transaction.atomic():
+                    for step, method, route in SESSION_FLOW:
+                        url, data = urls.get(route) or (reverse(route), None)
+                        counter = SessionQueries()
+                        with connection.execute_wrapper(counter):
+                            response = getattr(client, method.lower())(url, data)
+                        row = steps[step]
+                        row['status'] = response.status_code
+                        row['session_reads'] = max(row['session_reads'], counter.reads)
+                        row['session_writes'] = max(row['session_writes'], counter.writes)
+                        row['other'] = max(row['other'], counter.other)
+                    transaction.set_rollback(True)
+        results[engine] = steps
+    return results
+
+
+def find_regressions(results, baseline, tolerance=REGRESSION_TOLERANCE, min_delta_ms=REGRESSION_MIN_DELTA_MS):
+    """Compare a run against a baseline; query counts must not grow, p95 within tolerance"""
+    regressions = []
+    for key, current in sorted(results.items()):
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for field in ('queries_cold', 'queries'):
+            if current[field] > previous[field]:
+                regressions.append(f'{key}: {field} {previous[field]} -> {current[field]}')
+        allowed = max(previous['p95_ms'] * (1 + tolerance), previous['p95_ms'] + min_delta_ms)
+        if current['p95_ms'] > allowed:
+            regressions.append(f'{key}: p95 {previous["p95_ms"]:.1f}ms -> {current["p95_ms"]:.1f}ms')
+    return regressions
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+
+from content_management.benchmark import SESSION_FLOW, run_session_benchmark
+from content_management.synthetic import seed_dataset
+
+DJANGO_DEFAULT_MESSAGES = 'django.contrib.messages.storage.fallback.FallbackStorage'
+
+
+class Command(BaseCommand):
+    help = 'Count the session-table queries of a login-to-logout visit under each session engine'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--engines', nargs='+', choices=sorted(settings.SESSION_ENGINES), default=['db', 'cached_db', 'cache'],
+            help='Session stores to compare; the first is the baseline',
+        )
+        parser.add_argument(
+            '--message-storage', default=settings.MESSAGE_STORAGE,
+            help='Message storage used for every engine after the baseline',
+        )
+        parser.add_argument('--iterations', type=int, default=3, help='Visits per engine')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+        engines = options['engines']
+
+        isolated = override_settings(
+            CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'benchmark-sessions',
+            }},
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            SECURE_SSL_REDIRECT=False,
+            # Logging in is part of the flow; hashing cost is not what is measured
+            PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+        )
+        with isolated, transaction.atomic():
+            seed_dataset(users=2, courses=2, lessons=3, quizzes=1, questions=1, prefix='benchmark')
+            # The baseline is Django's default setup: database sessions with the fallback message storage
+            setups = [(engines[0], DJANGO_DEFAULT_MESSAGES)]
+            setups += [(engine, options['message_storage']) for engine in engines[1:]]
+            results = run_session_benchmark(setups, options['iterations'])
+            transaction.set_rollback(True)
+
+        self.report(engines, results)
+
+    def report(self, engines, results):
+        self.stdout.write(f'{"step":<20}' + ''.join(f'{engine:>18}' for engine in engines))
+        for step, _, _ in SESSION_FLOW:
+            cells = []
+            for engine in engines:
+                row = results[engine][step]
+                cells.append(f'{row["session_reads"]}r {row["session_writes"]}w +{row["other"]} ({row["status"]})')
+            self.stdout.write(f'{step:<20}' + ''.join(f'{cell:>18}' for cell in cells))
+        self.stdout.write('session reads (r) and writes (w), +other queries, (status)')
+
+        baseline = engines[0]
+        for engine in engines[1:]:
+            saved_reads = saved_writes = 0
+            for step, _, _ in SESSION_FLOW:
+                saved_reads += results[baseline][step]['session_reads'] - results[engine][step]['session_reads']
+                saved_writes += results[baseline][step]['session_writes'] - results[engine][step]['session_writes']
+            self.stdout.write(self.style.SUCCESS(
+                f'{engine}: {saved_reads} fewer session read(s) and {saved_writes} fewer write(s) '
+                f'than {baseline} over the visit'
+            ))
@@ -0,0 +1,122 @@
+import json
+import platform
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from content_management.benchmark import (
+    REGRESSION_MIN_DELTA_MS, REGRESSION_TOLERANCE, ROLES, find_regressions, run_benchmark,
+)
+from content_management.synthetic import seed_dataset
+
+
+class Command(BaseCommand):
+    help = 'Benchmark every courses, quizzes and accounts route against a synthetic dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20, help='Synthetic learners to create')
+        parser.add_argument('--courses', type=int, default=10, help='Synthetic courses to create')
+        parser.add_argument('--lessons', type=int, default=8, help='Lessons per course')
+        parser.add_argument('--quizzes', type=int, default=10, help='Synthetic quizzes to create')
+        parser.add_argument('--questions', type=int, default=10, help='Questions per quiz')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the dataset')
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per route and role')
+        parser.add_argument(
+            '--roles', nargs='+', choices=ROLES, default=['student', 'staff'],
+            help='Roles to drive the routes as',
+        )
+        parser.add_argument('--output', help='Write results as JSON to this path')
+        parser.add_argument('--baseline', help='Compare against results JSON from an earlier run')
+        parser.add_argument(
+            '--tolerance', type=float, default=REGRESSION_TOLERANCE,
+            help='Allowed relative p95 growth over the baseline before it counts as a regression',
+        )
+        parser.add_argument(
+            '--min-delta-ms', type=float, default=REGRESSION_MIN_DELTA_MS,
+            help='Ignore p95 growth smaller than this many milliseconds',
+        )
+        parser.add_argument(
+            '--fail-on-regression', action='store_true',
+            help='Exit with an error when any regression is found',
+        )
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+        baseline = self.load_baseline(options['baseline']) if options['baseline'] else None
+
+        # An isolated cache and a rolled-back transaction keep the run off real data
+        isolated = override_settings(
+            CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'benchmark-views',
+            }},
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            SECURE_SSL_REDIRECT=False,
+        )
+        with isolated, transaction.atomic():
+            seed_dataset(
+                users=options['users'],
+                courses=options['courses'],
+                lessons=max(options['lessons'], 2),
+                quizzes=max(options['quizzes'], 2),
+                questions=max(options['questions'], 1),
+                seed=options['seed'],
+                prefix='benchmark',
+            )
+            results = run_benchmark(roles=options['roles'], iterations=options['iterations'])
+            transaction.set_rollback(True)
+
+        self.report(results, baseline)
+
+        if options['output']:
+            payload = {
+                'captured_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'iterations': options['iterations'],
+                'dataset': {field: options[field] for field in ('users', 'courses', 'lessons', 'quizzes', 'questions', 'seed')},
+                'results': results,
+            }
+            Path(options['output']).write_text(json.dumps(payload, indent=2, sort_keys=True))
+            self.stdout.write(f'Wrote {options["output"]}')
+
+        if baseline is not None:
+            regressions = find_regressions(
+                results, baseline, tolerance=options['tolerance'], min_delta_ms=options['min_delta_ms'],
+            )
+            if regressions:
+                self.stdout.write(self.style.ERROR(f'{len(regressions)} regression(s) against {options["baseline"]}:'))
+                for regression in regressions:
+                    self.stdout.write(self.style.ERROR(f'  {regression}'))
+                if options['fail_on_regression']:
+                    raise CommandError('Benchmark regressed against the baseline')
+            else:
+                self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
+
+    def load_baseline(self, path):
+        try:
+            return json.loads(Path(path).read_text())['results']
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f'Could not read baseline {path}: {exc}')
+
+    def report(self, results, baseline):
+        self.stdout.write(
+            f'{"view":<48} {"status":>6} {"queries":>9} {"sql ms":>8} {"tpl ms":>8} '
+            f'{"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}'
+        )
+        for key, row in results.items():
+            queries = f'{row["queries_cold"]}/{row["queries"]}'
+            line = (
+                f'{key:<48} {row["status"]:>6} {queries:>9} {row["sql_ms"]:>8.2f} {row["template_ms"]:>8.2f} '
+                f'{row["p50_ms"]:>8.2f} {row["p95_ms"]:>8.2f} {row["p99_ms"]:>8.2f}'
+            )
+            previous = (baseline or {}).get(key)
+            if previous and (row['queries'] > previous['queries'] or row['queries_cold'] > previous['queries_cold']):
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+        self.stdout.write('queries = cold/warm; sql, template and wall times are for warm requests')
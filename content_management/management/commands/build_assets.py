@@ -0,0 +1,32 @@
+from urllib.error import URLError
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sex_education_system.assets import CSS_BUNDLE_OUTPUT, GOOGLE_FONTS_URL, build_css_bundle, fetch_fonts
+
+
+class Command(BaseCommand):
+    help = 'Build the minified CSS bundle (run before collectstatic), optionally refreshing self-hosted fonts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fetch-fonts', action='store_true',
+            help='Download the Latin subset of the Google Fonts into static/fonts and write static/css/fonts.css',
+        )
+        parser.add_argument('--fonts-url', default=GOOGLE_FONTS_URL, help='Google Fonts stylesheet to self-host')
+
+    def handle(self, *args, **options):
+        if options['fetch_fonts']:
+            try:
+                written = fetch_fonts(options['fonts_url'])
+            except (URLError, OSError) as exc:
+                raise CommandError(f'Could not download fonts: {exc}')
+            self.stdout.write(f'Wrote {len(written)} font file(s)')
+
+        original, minified, used = build_css_bundle()
+        for name in used:
+            self.stdout.write(f'  {name}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote static/{CSS_BUNDLE_OUTPUT}: {original / 1024:.1f} KiB -> {minified / 1024:.1f} KiB '
+            f'from {len(used)} file(s)'
+        ))
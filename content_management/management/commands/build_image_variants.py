@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import UserProfile
+from courses.models import Course
+from sex_education_system.images import AVATAR_WIDTHS, COURSE_IMAGE_WIDTHS, refresh_variants
+
+TARGETS = {
+    'course': (Course, 'image', 'image_variants', COURSE_IMAGE_WIDTHS),
+    'profile': (UserProfile, 'profile_picture', 'profile_picture_variants', AVATAR_WIDTHS),
+}
+
+
+class Command(BaseCommand):
+    help = 'Strip EXIF from existing uploads and generate their responsive WebP/JPEG variants'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model', choices=sorted(TARGETS), action='append', dest='models',
+            help='Only process this kind of image (repeatable; default all)',
+        )
+        parser.add_argument('--force', action='store_true', help='Rebuild variants that are already up to date')
+
+    def handle(self, *args, **options):
+        for key in options['models'] or sorted(TARGETS):
+            model, field_name, variants_field, widths = TARGETS[key]
+            rows = (
+                model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+                .only('pk', field_name, variants_field).order_by('pk')
+            )
+            built = skipped = 0
+            for instance in rows.iterator(chunk_size=200):
+                if options['force']:
+                    # Forget the recorded source so refresh_variants rebuilds
+                    getattr(instance, variants_field).pop('source', None)
+                if refresh_variants(instance, field_name, variants_field, widths):
+                    built += 1
+                    variants = getattr(instance, variants_field).get('variants', [])
+                    if not variants:
+                        self.stdout.write(self.style.WARNING(
+                            f'  {key} #{instance.pk}: {getattr(instance, field_name).name} is not a readable image'
+                        ))
+                else:
+                    skipped += 1
+            self.stdout.write(self.style.SUCCESS(f'{key}: built variants for {built} image(s), {skipped} up to date'))
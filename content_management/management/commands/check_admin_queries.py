@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from content_management.synthetic import seed_dataset
+from sex_education_system.admin_mixins import AnnotatedAdminMixin
+
+CHECKED_APPS = ('accounts', 'courses', 'quizzes')
+
+
+class Command(BaseCommand):
+    help = 'Load every admin changelist against a synthetic dataset and enforce its query budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=120, help='Synthetic learners (more than one page of rows)')
+        parser.add_argument('--courses', type=int, default=12, help='Synthetic courses')
+        parser.add_argument('--quizzes', type=int, default=12, help='Synthetic quizzes')
+
+    def handle(self, *args, **options):
+        isolated = override_settings(
+            CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'check-admin-queries',
+            }},
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            SECURE_SSL_REDIRECT=False,
+        )
+        failures = []
+        with isolated, transaction.atomic():
+            seed_dataset(
+                users=options['users'], courses=options['courses'], quizzes=options['quizzes'],
+                lessons=6, questions=5, prefix='admincheck',
+            )
+            client = Client(raise_request_exception=False)
+            client.force_login(User.objects.create_superuser('admincheck_admin', 'admincheck@example.com'))
+            for model, model_admin in sorted(admin.site._registry.items(), key=lambda item: item[0]._meta.label):
+                if model._meta.app_label not in CHECKED_APPS:
+                    continue
+                failures += self.check_changelist(client, model, model_admin)
+            transaction.set_rollback(True)
+
+        if failures:
+            for failure in failures:
+                self.stdout.write(self.style.ERROR(f'  {failure}'))
+            raise CommandError(f'{len(failures)} changelist(s) exceeded their query budget')
+        self.stdout.write(self.style.SUCCESS('Every changelist is within its query budget'))
+
+    def check_changelist(self, client, model, model_admin):
+        label = model._meta.label
+        # Admins showing only stored columns and list_select_related need no mixin; they get its default budget
+        budget = getattr(model_admin, 'changelist_query_budget', AnnotatedAdminMixin.changelist_query_budget)
+
+        url = reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+        # The default order, then the page sorted by each column (?o=<1-based list_display index>)
+        orderings = [None] + [str(index) for index in range(1, len(model_admin.list_display) + 1)]
+        failures = []
+        worst = 0
+        for ordering in orderings:
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url, {'o': ordering} if ordering else {})
+            worst = max(worst, len(queries))
+            if response.status_code != 200:
+                failures.append(f'{label} (o={ordering}): HTTP {response.status_code}')
+            elif len(queries) > budget:
+                failures.append(f'{label} (o={ordering}): {len(queries)} queries, budget {budget}')
+        style = self.style.ERROR if failures else self.style.SUCCESS
+        self.stdout.write(style(
+            f'{label:<32} {worst:>3} queries (budget {budget}) '
+            f'over {len(orderings)} orderings, {model._default_manager.count()} rows'
+        ))
+        return failures
@@ -0,0 +1,64 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from content_management.synthetic import seed_dataset
+
+
+class Command(BaseCommand):
+    help = 'Bulk-load a deterministic synthetic dataset for local performance work'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Learners to create')
+        parser.add_argument('--courses', type=int, default=50, help='Courses to create')
+        parser.add_argument('--lessons', type=int, default=10, help='Lessons per course')
+        parser.add_argument('--quizzes', type=int, default=50, help='Quizzes to create')
+        parser.add_argument('--questions', type=int, default=10, help='Questions per quiz')
+        parser.add_argument('--answers', type=int, default=4, help='Answer choices per question')
+        parser.add_argument('--courses-per-user', type=int, default=5, help='Courses each learner has started')
+        parser.add_argument(
+            '--attempts-per-user', type=int, default=10,
+            help='Quiz attempts per learner (at most one per quiz)',
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed gives the same data')
+        parser.add_argument('--prefix', default='synthetic', help='Prefix for generated usernames and titles')
+        parser.add_argument('--password', help='Password for every generated user (default: unusable)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        if options['attempts_per_user'] > options['quizzes']:
+            raise CommandError('--attempts-per-user cannot exceed --quizzes; only one attempt per quiz is allowed')
+        if User.objects.filter(username__startswith=f'{options["prefix"]}_user_').exists():
+            raise CommandError(f'Users with the prefix "{options["prefix"]}" already exist; choose another --prefix')
+
+        started = time.perf_counter()
+
+        def log(message):
+            self.stdout.write(f'[{time.perf_counter() - started:7.1f}s] {message}')
+
+        with transaction.atomic():
+            created = seed_dataset(
+                users=options['users'],
+                courses=options['courses'],
+                lessons=options['lessons'],
+                quizzes=options['quizzes'],
+                questions=options['questions'],
+                answers=options['answers'],
+                courses_per_user=options['courses_per_user'],
+                attempts_per_user=options['attempts_per_user'],
+                seed=options['seed'],
+                prefix=options['prefix'],
+                password=options['password'],
+                batch_size=options['batch_size'],
+                log=log,
+            )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Generated synthetic data in {elapsed:.1f}s'))
+        for name, count in created.items():
+            self.stdout.write(f'  {name}: {count}')
+        self.stdout.write('Run refresh_platform_stats to update the dashboard totals.')
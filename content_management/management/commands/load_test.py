@@ -0,0 +1,90 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urljoin, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from content_management.benchmark import percentile
+
+
+DEFAULT_PATHS = ['/courses/', '/quizzes/']
+
+
+async def fetch(host, port, path, headers):
+    """Issue one HTTP/1.0 GET and return (status, elapsed seconds)"""
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    request = f'GET {path} HTTP/1.0\r\nHost: {host}\r\n{headers}\r\n'
+    writer.write(request.encode('latin-1'))
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    status = int(status_line.split()[1]) if status_line else 0
+    return status, time.perf_counter() - started
+
+
+async def run_load(base_url, paths, concurrency, requests, headers):
+    """Drive `requests` GETs across `paths` with `concurrency` open connections"""
+    parts = urlsplit(base_url)
+    host, port = parts.hostname, parts.port or 80
+    targets = [urlsplit(urljoin(base_url, path)).path for path in paths]
+    queue = asyncio.Queue()
+    for index in range(requests):
+        queue.put_nowait(targets[index % len(targets)])
+
+    latencies, failures = [], 0
+
+    async def worker():
+        nonlocal failures
+        while not queue.empty():
+            path = queue.get_nowait()
+            try:
+                status, elapsed = await fetch(host, port, path, headers)
+            except OSError:
+                failures += 1
+                continue
+            if status >= 400 or status == 0:
+                failures += 1
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return sorted(latencies), failures, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = 'Load test the read views over HTTP and report throughput and latency percentiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'urls', nargs='+',
+            help='Base URL of each running server to compare, e.g. http://127.0.0.1:8000 http://127.0.0.1:8001',
+        )
+        parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS, help='Paths to request in rotation')
+        parser.add_argument('--concurrency', type=int, default=200, help='Concurrent connections')
+        parser.add_argument('--requests', type=int, default=5000, help='Total requests per server')
+        parser.add_argument('--session', help='sessionid cookie to send, for login-protected pages')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError('--concurrency and --requests must be positive')
+
+        headers = f"Cookie: sessionid={options['session']}\r\n" if options['session'] else ''
+
+        for base_url in options['urls']:
+            latencies, failures, elapsed = asyncio.run(run_load(
+                base_url, options['paths'], options['concurrency'], options['requests'], headers,
+            ))
+            if not latencies:
+                raise CommandError(f'No responses received from {base_url}')
+
+            self.stdout.write(self.style.MIGRATE_HEADING(base_url))
+            self.stdout.write(f'  requests/sec: {len(latencies) / elapsed:.1f}')
+            self.stdout.write(f'  mean: {statistics.mean(latencies) * 1000:.1f} ms')
+            for pct in (50, 95, 99):
+                self.stdout.write(f'  p{pct}: {percentile(latencies, pct) * 1000:.1f} ms')
+            if failures:
+                self.stdout.write(self.style.WARNING(f'  {failures} failed request(s)'))
@@ -0,0 +1,34 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Delete expired database sessions in small batches (schedule daily, e.g. as a cron job)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Sessions deleted per statement')
+        parser.add_argument(
+            '--pause', type=float, default=0.0,
+            help='Seconds to sleep between chunks, to leave room for live traffic',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only count the expired sessions')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = Session.objects.filter(expire_date__lt=now)
+        if options['dry_run']:
+            self.stdout.write(f'{expired.count()} expired session(s) would be deleted')
+            return
+
+        deleted = 0
+        # Each chunk commits on its own, so locks are held only briefly
+        while keys := list(expired.values_list('session_key', flat=True)[:options['chunk_size']]):
+            deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+            self.stdout.write(f'  ... {deleted} deleted')
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired session(s)'))
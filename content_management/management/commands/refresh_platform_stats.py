@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from content_management.stats import capture_snapshot, prune_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Capture a platform statistics snapshot for the content management dashboard'
+
+    def add_arguments(self, parser):
+        estimates = parser.add_mutually_exclusive_group()
+        estimates.add_argument(
+            '--estimate', dest='use_estimates', action='store_true', default=None,
+            help='Use planner row estimates for large tables (PostgreSQL only)',
+        )
+        estimates.add_argument(
+            '--exact', dest='use_estimates', action='store_false',
+            help='Always run exact COUNT(*) queries',
+        )
+        parser.add_argument(
+            '--keep-days', type=int, default=90,
+            help='Delete snapshots older than this many days',
+        )
+
+    def handle(self, *args, **options):
+        snapshot = capture_snapshot(use_estimates=options['use_estimates'])
+        pruned = prune_snapshots(options['keep_days'])
+
+        self.stdout.write(self.style.SUCCESS(f'Captured {snapshot}'))
+        for field in ('total_users', 'total_courses', 'total_lessons', 'total_quizzes', 'total_questions'):
+            delta = snapshot.deltas.get(field)
+            change = f' ({delta:+d} today)' if delta is not None else ''
+            self.stdout.write(f'  {field}: {getattr(snapshot, field)}{change}')
+        if snapshot.estimated:
+            self.stdout.write('  Some totals are planner estimates.')
+        if pruned:
+            self.stdout.write(f'Pruned {pruned} old snapshot(s)')
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:25
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStatsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('captured_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('total_users', models.PositiveBigIntegerField(default=0)),
+                ('total_courses', models.PositiveBigIntegerField(default=0)),
+                ('total_lessons', models.PositiveBigIntegerField(default=0)),
+                ('total_quizzes', models.PositiveBigIntegerField(default=0)),
+                ('total_questions', models.PositiveBigIntegerField(default=0)),
+                ('deltas', models.JSONField(default=dict, help_text='Change of each total over the previous day')),
+                ('estimated', models.BooleanField(default=False, help_text='Some totals come from planner row estimates')),
+            ],
+            options={
+                'ordering': ['-captured_at'],
+                'get_latest_by': 'captured_at',
+            },
+        ),
+    ]
@@ -1,3 +1,21 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class PlatformStatsSnapshot(models.Model):
+    """Periodically captured platform totals for the content management dashboard"""
+    captured_at = models.DateTimeField(default=timezone.now, db_index=True)
+    total_users = models.PositiveBigIntegerField(default=0)
+    total_courses = models.PositiveBigIntegerField(default=0)
+    total_lessons = models.PositiveBigIntegerField(default=0)
+    total_quizzes = models.PositiveBigIntegerField(default=0)
+    total_questions = models.PositiveBigIntegerField(default=0)
+    deltas = models.JSONField(default=dict, help_text="Change of each total over the previous day")
+    estimated = models.BooleanField(default=False, help_text="Some totals come from planner row estimates")
+    
+    class Meta:
+        ordering = ['-captured_at']
+        get_latest_by = 'captured_at'
+    
+    def __str__(self):
+        return f"Platform stats at {self.captured_at:%Y-%m-%d %H:%M}"
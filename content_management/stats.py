@@ -0,0 +1,101 @@
+"""
+Platform statistics snapshots.
+
+The content management dashboard reads its totals from the latest
+PlatformStatsSnapshot instead of running COUNT(*) over every table on
+each page load. Snapshots are captured by the refresh_platform_stats
+command, run on a schedule (see the cron service in render.yaml); a page
+load only captures one when none exists yet, and otherwise serves the
+latest even when it is older than PLATFORM_STATS_MAX_AGE seconds, so
+concurrent requests never recount the tables together. On PostgreSQL, tables whose planner
+estimate exceeds PLATFORM_STATS_ESTIMATE_THRESHOLD rows use that estimate
+instead of an exact count.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.utils import timezone
+
+from courses.models import Course, Lesson
+from quizzes.models import Question, Quiz
+from .models import PlatformStatsSnapshot
+
+TRACKED_MODELS = {
+    'total_users': User,
+    'total_courses': Course,
+    'total_lessons': Lesson,
+    'total_quizzes': Quiz,
+    'total_questions': Question,
+}
+
+
+def estimated_row_count(model):
+    """Planner row estimate for the model's table, or None when unavailable"""
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)',
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 for tables that have never been analyzed
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+def count_rows(model, use_estimates):
+    """Return (count, estimated) for the model's table"""
+    if use_estimates:
+        estimate = estimated_row_count(model)
+        if estimate is not None and estimate >= settings.PLATFORM_STATS_ESTIMATE_THRESHOLD:
+            return estimate, True
+    return model.objects.count(), False
+
+
+def capture_snapshot(use_estimates=None):
+    """Count every tracked table and store the totals with their daily deltas"""
+    if use_estimates is None:
+        use_estimates = settings.PLATFORM_STATS_USE_ESTIMATES
+
+    snapshot = PlatformStatsSnapshot()
+    for field, model in TRACKED_MODELS.items():
+        total, estimated = count_rows(model, use_estimates)
+        setattr(snapshot, field, total)
+        snapshot.estimated = snapshot.estimated or estimated
+
+    previous = (
+        PlatformStatsSnapshot.objects
+        .filter(captured_at__lte=snapshot.captured_at - timedelta(days=1))
+        .first()
+    )
+    if previous is not None:
+        snapshot.deltas = {
+            field: getattr(snapshot, field) - getattr(previous, field)
+            for field in TRACKED_MODELS
+        }
+    snapshot.save()
+    return snapshot
+
+
+def latest_snapshot():
+    """Latest snapshot, capturing the first one if none exists yet"""
+    snapshot = PlatformStatsSnapshot.objects.first()
+    if snapshot is None:
+        snapshot = capture_snapshot()
+    return snapshot
+
+
+def is_stale(snapshot):
+    """Whether the snapshot is older than PLATFORM_STATS_MAX_AGE (the refresh job is late)"""
+    return snapshot.captured_at < timezone.now() - timedelta(seconds=settings.PLATFORM_STATS_MAX_AGE)
+
+
+def prune_snapshots(keep_days):
+    """Delete snapshots older than ``keep_days`` days"""
+    cutoff = timezone.now() - timedelta(days=keep_days)
+    deleted, _ = PlatformStatsSnapshot.objects.filter(captured_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,192 @@
+import random
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from accounts.models import UserLearningStats, UserProfile
+from courses.models import Course, Lesson, UserCourseProgress
+from quizzes.grading import Grade
+from quizzes.models import Answer, Question, Quiz, UserQuizAttempt
+
+
+DIFFICULTIES = ['beginner', 'intermediate', 'advanced']
+
+
+def chunked(iterable, size):
+    """Yield lists of at most `size` items from an iterable"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def seed_dataset(users=20, courses=10, lessons=8, quizzes=10, questions=10, answers=4,
+                 courses_per_user=3, attempts_per_user=2, seed=0, prefix='synthetic',
+                 password=None, batch_size=5000, log=None):
+    """Bulk-create a reproducible dataset of learners, content, progress and quiz attempts.
+
+    Everything goes through bulk_create, so model signals never fire; profiles,
+    progress counters and learning stats are written directly instead.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    log = log or (lambda message: None)
+    created = {}
+
+    # Hashing once keeps a million-user run from spending hours in the hasher
+    password_hash = make_password(password) if password else make_password(None)
+    learners = []
+    for chunk in chunked(range(users), batch_size):
+        batch = User.objects.bulk_create(
+            User(username=f'{prefix}_user_{i}', email=f'{prefix}_user_{i}@example.com', password=password_hash)
+            for i in chunk
+        )
+        UserProfile.objects.bulk_create(UserProfile(user=user) for user in batch)
+        learners.extend(user.pk for user in batch)
+    created['users'] = len(learners)
+    log(f'{len(learners)} users')
+
+    course_objs = Course.objects.bulk_create(
+        (
+            Course(
+                title=f'{prefix.title()} course {i}',
+                description=f'Synthetic course {i} for load testing.',
+                difficulty=rng.choice(DIFFICULTIES),
+            )
+            for i in range(courses)
+        ),
+        batch_size=batch_size,
+    )
+    lesson_objs = Lesson.objects.bulk_create(
+        (
+            Lesson(course=course, title=f'Lesson {order}', content='Synthetic lesson content. ' * 20, order=order)
+            for course in course_objs
+            for order in range(1, lessons + 1)
+        ),
+        batch_size=batch_size,
+    )
+    lessons_by_course = {}
+    for lesson in lesson_objs:
+        lessons_by_course.setdefault(lesson.course_id, []).append(lesson.pk)
+    created['courses'] = len(course_objs)
+    created['lessons'] = len(lesson_objs)
+    log(f'{len(course_objs)} courses, {len(lesson_objs)} lessons')
+
+    quiz_objs = Quiz.objects.bulk_create(
+        (
+            Quiz(
+                title=f'{prefix.title()} quiz {i}',
+                description=f'Synthetic quiz {i} for load testing.',
+                course=course_objs[i % courses] if courses else None,
+            )
+            for i in range(quizzes)
+        ),
+        batch_size=batch_size,
+    )
+    question_objs = Question.objects.bulk_create(
+        (
+            Question(quiz=quiz, text=f'Question {order}?', order=order)
+            for quiz in quiz_objs
+            for order in range(1, questions + 1)
+        ),
+        batch_size=batch_size,
+    )
+    answer_objs = Answer.objects.bulk_create(
+        (
+            Answer(question=question, text=f'Choice {i}', is_correct=(i == 0))
+            for question in question_objs
+            for i in range(answers)
+        ),
+        batch_size=batch_size,
+    )
+    choices = {}
+    for answer in answer_objs:
+        choices.setdefault(answer.question_id, []).append(answer.pk)
+    answer_sheet = {quiz.pk: [] for quiz in quiz_objs}
+    for question in question_objs:
+        # The first choice of every question is the correct one
+        answer_sheet[question.quiz_id].append((question.pk, choices.get(question.pk, [])))
+    created['quizzes'] = len(quiz_objs)
+    created['questions'] = len(question_objs)
+    created['answers'] = len(answer_objs)
+    log(f'{len(quiz_objs)} quizzes, {len(question_objs)} questions, {len(answer_objs)} answers')
+
+    stats = {user_id: UserLearningStats(user_id=user_id, last_activity_at=now) for user_id in learners}
+    course_ids = [course.pk for course in course_objs]
+    passing_scores = {quiz.pk: quiz.passing_score for quiz in quiz_objs}
+    quiz_ids = list(passing_scores)
+    Completed = UserCourseProgress.completed_lessons.through
+
+    def progress_rows():
+        for user_id in learners:
+            for course_id in rng.sample(course_ids, k=min(len(course_ids), courses_per_user)):
+                course_lessons = lessons_by_course.get(course_id, [])
+                done = course_lessons[:rng.randint(0, len(course_lessons))]
+                finished = bool(course_lessons) and len(done) == len(course_lessons)
+                stats[user_id].courses_started += 1
+                stats[user_id].courses_completed += finished
+                progress = UserCourseProgress(
+                    user_id=user_id,
+                    course_id=course_id,
+                    completed=finished,
+                    completed_at=now if finished else None,
+                    completed_lesson_count=len(done),
+                    total_lesson_count=len(course_lessons),
+                )
+                progress._completed_lesson_ids = done
+                yield progress
+
+    created['progress'] = created['completed_lessons'] = 0
+    for chunk in chunked(progress_rows(), batch_size):
+        UserCourseProgress.objects.bulk_create(chunk)
+        links = [
+            Completed(usercourseprogress_id=progress.pk, lesson_id=lesson_id)
+            for progress in chunk
+            for lesson_id in progress._completed_lesson_ids
+        ]
+        Completed.objects.bulk_create(links, batch_size=batch_size)
+        created['progress'] += len(chunk)
+        created['completed_lessons'] += len(links)
+        log(f'{created["progress"]} progress rows')
+
+    def attempt_rows():
+        for user_id in learners:
+            skill = rng.random()
+            for quiz_id in rng.sample(quiz_ids, k=min(len(quiz_ids), attempts_per_user)):
+                picked, correct = {}, []
+                for question_id, options in answer_sheet[quiz_id]:
+                    if not options:
+                        continue
+                    answer_id = options[0] if rng.random() < skill else rng.choice(options)
+                    # Submitted answers arrive as POST strings
+                    picked[str(question_id)] = str(answer_id)
+                    if answer_id == options[0]:
+                        correct.append(question_id)
+                # Scored exactly as take_quiz_view scores a real submission
+                grade = Grade(picked, correct, len(answer_sheet[quiz_id]))
+                score = grade.score
+                user_stats = stats[user_id]
+                user_stats.total_attempts += 1
+                user_stats.score_total += score
+                user_stats.best_score = max(user_stats.best_score, score)
+                yield UserQuizAttempt(
+                    user_id=user_id,
+                    quiz_id=quiz_id,
+                    score=score,
+                    answers=picked,
+                    correct_question_ids=correct,
+                    correct_count=grade.correct_count,
+                    question_total=grade.total,
+                    passed=score >= passing_scores[quiz_id],
+                    time_taken_minutes=rng.randint(1, 30),
+                )
+
+    created['attempts'] = 0
+    for chunk in chunked(attempt_rows(), batch_size):
+        UserQuizAttempt.objects.bulk_create(chunk)
+        created['attempts'] += len(chunk)
+        log(f'{created["attempts"]} quiz attempts')
+
+    UserLearningStats.objects.bulk_create(stats.values(), batch_size=batch_size)
+    return created
@@ -1,35 +1,51 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import render
 from django.contrib.admin.views.decorators import staff_member_required
-from courses.models import Course, Lesson
-from quizzes.models import Quiz, Question
-from accounts.models import UserProfile
+from django.utils.crypto import constant_time_compare
+from courses.models import Course
 from django.contrib.auth.models import User
+from sex_education_system.caching import view_cache_stats
+from sex_education_system.instrumentation import registry
+from .stats import is_stale, latest_snapshot
 
 
 @staff_member_required
 def dashboard_view(request):
     """Admin dashboard with statistics"""
-    # Get statistics
-    total_users = User.objects.count()
-    total_courses = Course.objects.count()
-    total_lessons = Lesson.objects.count()
-    total_quizzes = Quiz.objects.count()
-    total_questions = Question.objects.count()
+    # Totals are served from the latest platform stats snapshot
+    snapshot = latest_snapshot()
     
     # Recent users
     recent_users = User.objects.order_by('-date_joined')[:5]
     
     # Recent courses
-    recent_courses = Course.objects.order_by('-created_at')[:5]
+    recent_courses = Course.objects.with_stats().order_by('-created_at')[:5]
     
     context = {
-        'total_users': total_users,
-        'total_courses': total_courses,
-        'total_lessons': total_lessons,
-        'total_quizzes': total_quizzes,
-        'total_questions': total_questions,
+        'total_users': snapshot.total_users,
+        'total_courses': snapshot.total_courses,
+        'total_lessons': snapshot.total_lessons,
+        'total_quizzes': snapshot.total_quizzes,
+        'total_questions': snapshot.total_questions,
+        'stats_deltas': snapshot.deltas,
+        'stats_estimated': snapshot.estimated,
+        'stats_refreshed_at': snapshot.captured_at,
+        'stats_stale': is_stale(snapshot),
         'recent_users': recent_users,
         'recent_courses': recent_courses,
+        'view_cache_stats': view_cache_stats(),
     }
     
     return render(request, 'pages/content_dashboard.html', context)
+
+
+def metrics_view(request):
+    """Per-view request metrics in Prometheus text format (staff or metrics token)"""
+    token = settings.METRICS_TOKEN
+    authorized = request.user.is_staff or (
+        token and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    )
+    if not authorized:
+        return HttpResponseForbidden('Metrics are only available to staff.')
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,4 +1,9 @@
 from django.contrib import admin
+from django.db.models import Case, F, FloatField, Value, When
+
+from sex_education_system.admin_mixins import (
+    AnnotatedAdminMixin, LargeTableAdminMixin, annotated_column, related_id_filter,
+)
 from .models import Course, Lesson, UserCourseProgress
 
 
@@ -11,7 +16,7 @@ class LessonInline(admin.TabularInline):
 
 
 @admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
+class CourseAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     """Admin interface for Course"""
     list_display = ('title', 'difficulty', 'lesson_count', 'enrolled_count', 'is_published', 'created_at')
     list_filter = ('difficulty', 'is_published', 'created_at')
@@ -29,12 +34,19 @@ class CourseAdmin(admin.ModelAdmin):
         }),
     )
 
+    lesson_count = annotated_column('num_lessons', 'Lessons')
+    enrolled_count = annotated_column('num_enrolled', 'Enrolled')
+
+    def annotate_queryset(self, queryset):
+        return queryset.with_stats()
+
 
 @admin.register(Lesson)
-class LessonAdmin(admin.ModelAdmin):
+class LessonAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     """Admin interface for Lesson"""
     list_display = ('title', 'course', 'order', 'duration_minutes', 'created_at')
     list_filter = ('course', 'created_at')
+    list_select_related = ('course',)
     search_fields = ('title', 'content', 'course__title')
     ordering = ('course', 'order')
     
@@ -51,11 +63,22 @@ class LessonAdmin(admin.ModelAdmin):
 
 
 @admin.register(UserCourseProgress)
-class UserCourseProgressAdmin(admin.ModelAdmin):
+class UserCourseProgressAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Admin interface for UserCourseProgress"""
-    list_display = ('user', 'course', 'progress_percentage', 'completed', 'started_at')
-    list_filter = ('completed', 'started_at', 'course')
-    search_fields = ('user__username', 'course__title')
+    list_display = ('user', 'course', 'progress', 'completed', 'started_at')
+    list_filter = ('completed', related_id_filter('course'))
+    list_select_related = ('user', 'course')
+    date_hierarchy = 'started_at'
+    ordering = ('-started_at', '-id')
+    autocomplete_fields = ('user', 'course')
+    list_annotations = {
+        'progress_ratio': Case(
+            When(total_lesson_count=0, then=Value(0.0)),
+            default=F('completed_lesson_count') * 1.0 / F('total_lesson_count'),
+            output_field=FloatField(),
+        ),
+    }
+    search_fields = ('user__username',)
     filter_horizontal = ('completed_lessons',)
     readonly_fields = ('started_at', 'progress_percentage')
     
@@ -71,3 +94,22 @@ class UserCourseProgressAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+    progress = annotated_column('progress_ratio', 'Progress %', value=lambda obj: obj.progress_percentage)
+
+    def get_readonly_fields(self, request, obj=None):
+        """The course is fixed once saved, since the lesson choices come from it"""
+        readonly = super().get_readonly_fields(request, obj)
+        return (*readonly, 'course') if obj is not None else readonly
+
+    def get_form(self, request, obj=None, **kwargs):
+        """Only offer the lessons of the progress row's own course"""
+        form = super().get_form(request, obj, **kwargs)
+        lessons = form.base_fields.get('completed_lessons')
+        if lessons is not None:
+            if obj is None:
+                lessons.queryset = Lesson.objects.none()
+                lessons.help_text = 'Save the progress row first, then pick its completed lessons.'
+            else:
+                lessons.queryset = Lesson.objects.filter(course_id=obj.course_id)
+        return form
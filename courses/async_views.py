@@ -0,0 +1,82 @@
+"""
+Async variants of the read-heavy course views.
+
+These are routed instead of their counterparts in ``views.py`` when
+``settings.ASYNC_VIEWS`` is enabled and the site is served through ASGI.
+All data is loaded with the async ORM before rendering, because template
+rendering must not trigger lazy queries inside the event loop.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.http import Http404
+from django.shortcuts import render
+
+from sex_education_system.caching import cache_per_role
+from sex_education_system.pagination import keyset_paginate
+from .models import Course, Lesson, UserCourseProgress
+from .sequence import aget_lesson_sequence
+
+
+async def aget_object_or_404(queryset, **lookup):
+    try:
+        return await queryset.aget(**lookup)
+    except queryset.model.DoesNotExist:
+        raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+
+
+@login_required
+@cache_per_role('course_list', per_user=True)
+async def course_list_view(request):
+    """Display all published courses (excluding archived)"""
+    request.user = await request.auser()
+    courses = Course.objects.with_stats().filter(is_published=True, is_archived=False)
+    page = await sync_to_async(keyset_paginate)(request, courses, '-created_at')
+    return render(request, 'pages/course_list.html', {'courses': page, 'page': page})
+
+
+@login_required
+@cache_per_role('course_detail', per_user=True)
+async def course_detail_view(request, course_id):
+    """Display course details and lessons"""
+    user = request.user = await request.auser()
+    courses = Course.objects.with_stats()
+    if user.is_staff:
+        course = await aget_object_or_404(courses, id=course_id)
+    else:
+        course = await aget_object_or_404(courses, id=course_id, is_published=True, is_archived=False)
+    # Lesson bodies are not shown on the detail page
+    lessons = [
+        lesson async for lesson in course.lessons.only('id', 'course_id', 'title', 'order', 'duration_minutes')
+    ]
+    
+    progress, created = await UserCourseProgress.objects.aget_or_create(user=user, course=course)
+    
+    context = {
+        'course': course,
+        'lessons': lessons,
+        'progress': progress,
+    }
+    return render(request, 'pages/course_detail.html', context)
+
+
+@login_required
+async def lesson_view(request, course_id, lesson_id):
+    """Display lesson content"""
+    user = request.user = await request.auser()
+    course = await aget_object_or_404(Course.objects.all(), id=course_id, is_published=True)
+    lesson = await aget_object_or_404(Lesson.objects.all(), id=lesson_id, course=course)
+    
+    progress, created = await UserCourseProgress.objects.aget_or_create(user=user, course=course)
+    
+    sequence = await aget_lesson_sequence(course)
+    is_completed = await progress.completed_lessons.filter(id=lesson_id).aexists()
+    
+    context = {
+        'course': course,
+        'lesson': lesson,
+        'progress': progress,
+        'previous_lesson': sequence.previous(lesson.id),
+        'next_lesson': sequence.next(lesson.id),
+        'is_completed': is_completed,
+    }
+    return render(request, 'pages/lesson.html', context)
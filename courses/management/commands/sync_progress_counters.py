@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Max, Min, Q
+
+from courses.models import UserCourseProgress, completed_count_subquery, total_count_subquery
+
+
+class Command(BaseCommand):
+    help = 'Backfill or verify the denormalized lesson counters on UserCourseProgress'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify', action='store_true',
+            help='Only report rows whose stored counters disagree with the data',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=50000,
+            help='Number of primary keys covered by each UPDATE statement',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        bounds = UserCourseProgress.objects.aggregate(low=Min('pk'), high=Max('pk'))
+        if bounds['low'] is None:
+            self.stdout.write('No progress rows found.')
+            return
+
+        touched = 0
+        for start in range(bounds['low'], bounds['high'] + 1, batch_size):
+            batch = UserCourseProgress.objects.filter(pk__gte=start, pk__lt=start + batch_size)
+            if options['verify']:
+                touched += self.count_mismatches(batch)
+            else:
+                # One set-based UPDATE per primary-key window keeps locks short
+                with transaction.atomic():
+                    touched += batch.update(
+                        completed_lesson_count=completed_count_subquery(),
+                        total_lesson_count=total_count_subquery(),
+                    )
+            self.stdout.write(f'  processed ids {start}-{min(start + batch_size - 1, bounds["high"])}')
+
+        if options['verify']:
+            style = self.style.SUCCESS if touched == 0 else self.style.ERROR
+            self.stdout.write(style(f'{touched} progress row(s) with stale counters'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Recomputed counters for {touched} progress row(s)'))
+
+    def count_mismatches(self, batch):
+        return (
+            batch.annotate(
+                actual_completed=completed_count_subquery(),
+                actual_total=total_count_subquery(),
+            )
+            .filter(
+                ~Q(completed_lesson_count=F('actual_completed'))
+                | ~Q(total_lesson_count=F('actual_total'))
+            )
+            .count()
+        )
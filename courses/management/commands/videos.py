@@ -0,0 +1,183 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Q
+
+from courses.models import Course, Lesson
+from courses.video import AVAILABLE, UNCHECKED, VIMEO, YOUTUBE, parse_video_url
+from courses.video_probe import due_for_check, get_probe_backend, probe_lessons
+
+
+class Command(BaseCommand):
+    help = 'Check, backfill, clear or report on lesson video URLs'
+
+    def add_arguments(self, parser):
+        actions = parser.add_subparsers(dest='action', required=True)
+
+        check = actions.add_parser('check', help='List lessons whose video URL is unrecognised or whose parsed fields are stale')
+        backfill = actions.add_parser(
+            'backfill', help='Re-parse every lesson video URL into the stored provider, id, start and embed URL fields',
+        )
+        clear = actions.add_parser('clear', help='Remove video URLs in a single UPDATE')
+        report = actions.add_parser('report', help='Summarise video URLs by provider and course')
+        probe = actions.add_parser('probe', help='Check whether each video can still be embedded')
+
+        for action in (check, backfill, clear, report, probe):
+            action.add_argument(
+                '--course', type=int, action='append', dest='courses', metavar='COURSE_ID',
+                help='Only include lessons of this course (repeatable)',
+            )
+        check.add_argument('--chunk-size', type=int, default=2000, help='Lessons fetched per database round trip')
+        check.add_argument('--verbose-list', action='store_true', help='Print every lesson, not only problems')
+        backfill.add_argument('--batch-size', type=int, default=1000, help='Lessons loaded and updated per batch')
+        clear.add_argument('--unrecognised', action='store_true', help='Only clear URLs that are not YouTube or Vimeo')
+        clear.add_argument('--dry-run', action='store_true', help='Show what would be cleared without changing anything')
+        probe.add_argument('--all', action='store_true', help='Recheck every video, not only unchecked, failed or expired ones')
+        probe.add_argument('--workers', type=int, help='Concurrent probe requests (default VIDEO_PROBE_WORKERS)')
+        probe.add_argument('--timeout', type=float, help='Seconds to wait per probe (default VIDEO_PROBE_TIMEOUT)')
+        probe.add_argument('--chunk-size', type=int, default=500, help='Lessons probed and saved per batch')
+        probe.add_argument(
+            '--endpoint', action='append', default=[], metavar='PROVIDER=URL',
+            help='Override an oEmbed endpoint, e.g. youtube=http://127.0.0.1:9000/oembed',
+        )
+
+    def handle(self, *args, **options):
+        lessons = Lesson.objects.all()
+        if options['courses']:
+            missing = set(options['courses']) - set(Course.objects.filter(pk__in=options['courses']).values_list('pk', flat=True))
+            if missing:
+                raise CommandError(f'Unknown course id(s): {", ".join(map(str, sorted(missing)))}')
+            lessons = lessons.filter(course_id__in=options['courses'])
+        # A backfill also resets the parsed fields of lessons whose URL was removed
+        if options['action'] != 'backfill':
+            lessons = lessons.filter(video_url__isnull=False).exclude(video_url='')
+        getattr(self, f'handle_{options["action"]}')(lessons, options)
+
+    def handle_check(self, lessons, options):
+        chunk_size = options['chunk_size']
+        total = lessons.count()
+        self.stdout.write(f'Checking {total} lesson(s) with video URLs')
+
+        rows = (
+            lessons.select_related('course')
+            .only('id', 'title', 'video_url', *Lesson.VIDEO_FIELDS, 'course__title')
+            .order_by('pk')
+        )
+        checked = unrecognised = stale = 0
+        for lesson in rows.iterator(chunk_size=chunk_size):
+            checked += 1
+            parsed = parse_video_url(lesson.video_url)
+            stored = (lesson.video_provider, lesson.video_id, lesson.video_start, lesson.video_embed_url)
+            problem = None
+            if parsed is None:
+                unrecognised += 1
+                problem = 'unrecognised URL'
+            elif tuple(parsed) != stored:
+                stale += 1
+                problem = 'stored fields are stale (run videos backfill)'
+            if problem or options['verbose_list']:
+                status = self.style.WARNING(problem) if problem else self.style.SUCCESS(lesson.get_video_provider_display())
+                self.stdout.write(f'  #{lesson.pk} {lesson.course.title} - {lesson.title}: {status}')
+                self.stdout.write(f'      {lesson.video_url}')
+            if checked % chunk_size == 0:
+                self.stdout.write(f'  ... {checked}/{total} checked')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked} lesson(s): {unrecognised} unrecognised, {stale} stale'
+        ))
+
+    def handle_backfill(self, lessons, options):
+        batch_size = options['batch_size']
+        fields = [*Lesson.VIDEO_FIELDS, *Lesson.VIDEO_STATUS_FIELDS]
+        rows = lessons.only('id', 'video_url', *fields).order_by('pk')
+
+        checked = changed = 0
+        batch = []
+        for lesson in rows.iterator(chunk_size=batch_size):
+            checked += 1
+            before = [getattr(lesson, field) for field in fields]
+            lesson.parse_video()
+            if before != [getattr(lesson, field) for field in fields]:
+                batch.append(lesson)
+            if len(batch) >= batch_size:
+                changed += Lesson.objects.bulk_update(batch, fields)
+                batch = []
+        if batch:
+            changed += Lesson.objects.bulk_update(batch, fields)
+
+        self.stdout.write(self.style.SUCCESS(f'Checked {checked} lesson(s), updated {changed}'))
+
+    def handle_clear(self, lessons, options):
+        if options['unrecognised']:
+            lessons = lessons.filter(video_provider='')
+        count = lessons.count()
+        if options['dry_run']:
+            self.stdout.write(f'Would clear the video URL of {count} lesson(s)')
+            for course_title, lesson_count in self.count_by_course(lessons):
+                self.stdout.write(f'  {course_title}: {lesson_count}')
+            return
+        cleared = lessons.update(
+            video_url=None, video_provider='', video_id='', video_start=0, video_embed_url='',
+            video_status=UNCHECKED, video_status_detail='', video_checked_at=None,
+        )
+        self.stdout.write(self.style.SUCCESS(f'Cleared the video URL of {cleared} lesson(s)'))
+
+    def handle_report(self, lessons, options):
+        totals = lessons.aggregate(
+            total=Count('pk'),
+            youtube=Count('pk', filter=Q(video_provider=YOUTUBE)),
+            vimeo=Count('pk', filter=Q(video_provider=VIMEO)),
+            unrecognised=Count('pk', filter=Q(video_provider='')),
+            with_start=Count('pk', filter=Q(video_start__gt=0)),
+        )
+        self.stdout.write(f'Lessons with video URLs: {totals["total"]}')
+        for key in ('youtube', 'vimeo', 'unrecognised', 'with_start'):
+            self.stdout.write(f'  {key.replace("_", " ")}: {totals[key]}')
+        self.stdout.write('Top courses by video count:')
+        for course_title, lesson_count in self.count_by_course(lessons):
+            self.stdout.write(f'  {course_title}: {lesson_count}')
+
+    def handle_probe(self, lessons, options):
+        endpoints = dict(settings.VIDEO_OEMBED_ENDPOINTS)
+        for override in options['endpoint']:
+            provider, _, url = override.partition('=')
+            if not url:
+                raise CommandError(f'--endpoint expects PROVIDER=URL, got "{override}"')
+            endpoints[provider] = url
+        backend = get_probe_backend(endpoints=endpoints, timeout=options['timeout'])
+
+        if not options['all']:
+            lessons = due_for_check(lessons)
+        else:
+            lessons = lessons.exclude(video_provider='')
+        total = lessons.count()
+        self.stdout.write(f'Probing {total} video(s)')
+
+        rows = lessons.only('id', *Lesson.VIDEO_FIELDS, *Lesson.VIDEO_STATUS_FIELDS).order_by('pk')
+        chunk_size = options['chunk_size']
+        counts = {}
+        probed = 0
+        last_pk = 0
+        # Keyset batches keep memory flat and are unaffected by rows leaving the filter
+        while batch := list(rows.filter(pk__gt=last_pk)[:chunk_size]):
+            last_pk = batch[-1].pk
+            checked = list(probe_lessons(batch, backend=backend, workers=options['workers']))
+            Lesson.objects.bulk_update(checked, Lesson.VIDEO_STATUS_FIELDS)
+            for lesson in checked:
+                counts[lesson.video_status] = counts.get(lesson.video_status, 0) + 1
+                if lesson.video_status != AVAILABLE:
+                    self.stdout.write(self.style.WARNING(
+                        f'  #{lesson.pk} {lesson.get_video_status_display()}: {lesson.video_status_detail}'
+                    ))
+            probed += len(checked)
+            self.stdout.write(f'  ... {probed}/{total} probed')
+
+        summary = ', '.join(f'{count} {status}' for status, count in sorted(counts.items())) or 'nothing to do'
+        self.stdout.write(self.style.SUCCESS(f'Probed {probed} video(s): {summary}'))
+
+    def count_by_course(self, lessons, limit=20):
+        return (
+            lessons.order_by()
+            .values_list('course__title')
+            .annotate(total=Count('pk'))
+            .order_by('-total', 'course__title')[:limit]
+        )
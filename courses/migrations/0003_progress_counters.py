@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:20
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    UserCourseProgress = apps.get_model('courses', 'UserCourseProgress')
+    Lesson = apps.get_model('courses', 'Lesson')
+    Through = UserCourseProgress.completed_lessons.through
+
+    completed = (
+        Through.objects.filter(usercourseprogress=OuterRef('pk'))
+        .order_by()
+        .values('usercourseprogress')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    total = (
+        Lesson.objects.filter(course=OuterRef('course'))
+        .order_by()
+        .values('course')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    UserCourseProgress.objects.update(
+        completed_lesson_count=Coalesce(Subquery(completed), 0),
+        total_lesson_count=Coalesce(Subquery(total), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_course_is_archived'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usercourseprogress',
+            name='completed_lesson_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='usercourseprogress',
+            name='total_lesson_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
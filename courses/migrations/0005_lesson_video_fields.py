@@ -0,0 +1,115 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:37
+
+import re
+from urllib.parse import parse_qs, urlsplit
+
+from django.db import migrations, models
+
+# A frozen copy of courses.video.parse_video_url as of this migration, so later
+# changes to the parser do not change what the backfill did.
+_YOUTUBE_HOST = re.compile(r'^(?:www\.|m\.|music\.)?(?:youtube\.com|youtube-nocookie\.com)$')
+_YOUTUBE_PATH = re.compile(r'^/(?:embed|v|shorts|live)/([A-Za-z0-9_-]{6,})')
+_YOUTU_BE_PATH = re.compile(r'^/([A-Za-z0-9_-]{6,})')
+_YOUTUBE_ID = re.compile(r'^[A-Za-z0-9_-]{6,}$')
+_VIMEO_HOST = re.compile(r'^(?:www\.|player\.)?vimeo\.com$')
+_VIMEO_PATH = re.compile(r'^/(?:video/|channels/[\w-]+/|groups/[\w-]+/videos/)?(\d+)(?:/|$)')
+_TIMESTAMP = re.compile(r'^(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s?)?$')
+
+BATCH_SIZE = 1000
+
+
+def parse_timestamp(value):
+    match = _TIMESTAMP.match(value or '')
+    if not match or not any(match.groups()):
+        return 0
+    hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def parse_video_url(url):
+    """(provider, video id, start, embed url) for a YouTube or Vimeo URL, else None"""
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    query = parse_qs(parts.query)
+    fragment = parse_qs(parts.fragment)
+
+    if _YOUTUBE_HOST.match(host) or host == 'youtu.be':
+        if host == 'youtu.be':
+            match = _YOUTU_BE_PATH.match(parts.path)
+            video_id = match.group(1) if match else None
+        elif parts.path == '/watch':
+            video_id = query.get('v', [None])[0]
+            if video_id and not _YOUTUBE_ID.match(video_id):
+                video_id = None
+        else:
+            match = _YOUTUBE_PATH.match(parts.path)
+            video_id = match.group(1) if match else None
+        if not video_id:
+            return None
+        start = parse_timestamp((query.get('t') or query.get('start') or fragment.get('t') or [''])[0])
+        embed_url = f'https://www.youtube-nocookie.com/embed/{video_id}'
+        return 'youtube', video_id, start, f'{embed_url}?start={start}' if start else embed_url
+
+    if _VIMEO_HOST.match(host):
+        match = _VIMEO_PATH.match(parts.path)
+        if not match:
+            return None
+        video_id = match.group(1)
+        start = parse_timestamp((fragment.get('t') or query.get('t') or [''])[0])
+        embed_url = f'https://player.vimeo.com/video/{video_id}'
+        return 'vimeo', video_id, start, f'{embed_url}#t={start}s' if start else embed_url
+
+    return None
+
+
+def backfill_video_fields(apps, schema_editor):
+    Lesson = apps.get_model('courses', 'Lesson')
+    fields = ['video_provider', 'video_id', 'video_start', 'video_embed_url']
+    lessons = (
+        Lesson.objects.exclude(video_url__isnull=True).exclude(video_url='')
+        .only('id', 'video_url').order_by('pk')
+    )
+    batch = []
+    for lesson in lessons.iterator(chunk_size=BATCH_SIZE):
+        parsed = parse_video_url(lesson.video_url)
+        if parsed:
+            lesson.video_provider, lesson.video_id, lesson.video_start, lesson.video_embed_url = parsed
+            batch.append(lesson)
+        if len(batch) >= BATCH_SIZE:
+            Lesson.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        Lesson.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_course_content_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='video_embed_url',
+            field=models.URLField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_id',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_provider',
+            field=models.CharField(blank=True, choices=[('youtube', 'YouTube'), ('vimeo', 'Vimeo')], editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_start',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_video_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:39
+
+from django.db import migrations, models
+
+
+def mark_unsupported_urls(apps, schema_editor):
+    Lesson = apps.get_model('courses', 'Lesson')
+    Lesson.objects.exclude(video_url__isnull=True).exclude(video_url='').filter(
+        video_provider='',
+    ).update(video_status='unsupported')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_lesson_video_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='video_checked_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_status',
+            field=models.CharField(choices=[('unchecked', 'Not checked yet'), ('ok', 'Available'), ('unavailable', 'Unavailable'), ('error', 'Check failed'), ('unsupported', 'Unsupported URL')], default='unchecked', editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_status_detail',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.RunPython(mark_unsupported_urls, migrations.RunPython.noop),
+    ]
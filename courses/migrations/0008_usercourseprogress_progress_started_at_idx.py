@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_course_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usercourseprogress',
+            index=models.Index(fields=['started_at', 'id'], name='progress_started_at_idx'),
+        ),
+    ]
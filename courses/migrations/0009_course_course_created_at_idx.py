@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0008_usercourseprogress_progress_started_at_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['created_at', 'id'], name='course_created_at_idx'),
+        ),
+    ]
@@ -1,6 +1,38 @@
 from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
 from django.contrib.auth.models import User
 
+from sex_education_system.caching import CATALOG, bump_version, user_namespace
+from sex_education_system.images import COURSE_IMAGE_WIDTHS, delete_variants, schedule_refresh_variants
+
+from .video import PROVIDER_CHOICES, STATUS_CHOICES, UNCHECKED, UNSUPPORTED, parse_video_url, watch_url
+
+
+def _count_subquery(queryset, field):
+    """Correlated COUNT of ``queryset`` rows whose ``field`` points at the outer row"""
+    counts = (
+        queryset.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+class CourseQuerySet(models.QuerySet):
+    """QuerySet helpers for catalog-style course listings"""
+
+    def with_stats(self):
+        """Annotate lesson and enrollment counts in the same SELECT"""
+        return self.annotate(
+            num_lessons=_count_subquery(Lesson.objects.all(), 'course'),
+            num_enrolled=_count_subquery(UserCourseProgress.objects.all(), 'course'),
+        )
+
 
 class Course(models.Model):
     """Course model for educational content"""
@@ -13,24 +45,50 @@ class Course(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
     image = models.ImageField(upload_to='courses/', null=True, blank=True)
+    # Resized WebP/JPEG copies of the image (see sex_education_system.images)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     difficulty = models.CharField(max_length=20, choices=DIFFICULTY_CHOICES, default='beginner')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_published = models.BooleanField(default=True)
     is_archived = models.BooleanField(default=False)
+    # Bumped whenever the course or its lessons change; keys cached lesson data
+    content_version = models.PositiveIntegerField(default=0, editable=False)
+    
+    objects = CourseQuerySet.as_manager()
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of the course lists (see sex_education_system.pagination)
+            models.Index(fields=['created_at', 'id'], name='course_created_at_idx'),
+        ]
     
     def __str__(self):
         return self.title
     
+    # Only ever changed by queryset updates (F() increments, background image jobs),
+    # so a save of a stale instance must not write them back
+    UPDATED_IN_DATABASE = ('content_version', 'image_variants')
+    
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.UPDATED_IN_DATABASE
+            ]
+        super().save(*args, **kwargs)
+    
     @property
     def lesson_count(self):
+        if hasattr(self, 'num_lessons'):
+            return self.num_lessons
         return self.lessons.count()
     
     @property
     def enrolled_count(self):
+        if hasattr(self, 'num_enrolled'):
+            return self.num_enrolled
         return UserCourseProgress.objects.filter(course=self).count()
 
 
@@ -45,12 +103,54 @@ class Lesson(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Parsed from video_url on save, so pages never parse URLs while rendering
+    video_provider = models.CharField(max_length=20, choices=PROVIDER_CHOICES, blank=True, editable=False)
+    video_id = models.CharField(max_length=64, blank=True, editable=False)
+    video_start = models.PositiveIntegerField(default=0, editable=False)
+    video_embed_url = models.URLField(blank=True, editable=False)
+    
+    # Last availability check, refreshed by `manage.py videos probe`
+    video_status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=UNCHECKED, editable=False)
+    video_status_detail = models.CharField(max_length=200, blank=True, editable=False)
+    video_checked_at = models.DateTimeField(null=True, blank=True, editable=False)
+    
+    VIDEO_FIELDS = ['video_provider', 'video_id', 'video_start', 'video_embed_url']
+    VIDEO_STATUS_FIELDS = ['video_status', 'video_status_detail', 'video_checked_at']
+    
     class Meta:
         ordering = ['course', 'order']
         unique_together = ['course', 'order']
     
     def __str__(self):
         return f"{self.course.title} - {self.title}"
+    
+    def save(self, *args, **kwargs):
+        self.parse_video()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'video_url' in update_fields:
+            kwargs['update_fields'] = {*update_fields, *self.VIDEO_FIELDS, *self.VIDEO_STATUS_FIELDS}
+        super().save(*args, **kwargs)
+    
+    def parse_video(self):
+        """Refresh the stored video fields from video_url"""
+        parsed = parse_video_url(self.video_url)
+        identity = (self.video_provider, self.video_id)
+        self.video_provider = parsed.provider if parsed else ''
+        self.video_id = parsed.video_id if parsed else ''
+        self.video_start = parsed.start if parsed else 0
+        self.video_embed_url = parsed.embed_url if parsed else ''
+        
+        # A different video invalidates the last availability check
+        status = UNSUPPORTED if self.video_url and not parsed else UNCHECKED
+        if identity != (self.video_provider, self.video_id) or (status == UNSUPPORTED) != (self.video_status == UNSUPPORTED):
+            self.video_status = status
+            self.video_status_detail = ''
+            self.video_checked_at = None
+    
+    @property
+    def video_watch_url(self):
+        """Canonical link to the video on its provider's site, or the raw URL"""
+        return watch_url(self.video_provider, self.video_id, self.video_start) or self.video_url
 
 
 class UserCourseProgress(models.Model):
@@ -61,24 +161,202 @@ class UserCourseProgress(models.Model):
     completed = models.BooleanField(default=False)
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    # Denormalized counters maintained by the signal handlers below
+    completed_lesson_count = models.PositiveIntegerField(default=0, editable=False)
+    total_lesson_count = models.PositiveIntegerField(default=0, editable=False)
     
     class Meta:
         unique_together = ['user', 'course']
         verbose_name_plural = 'User course progress'
+        indexes = [
+            # Admin changelist order (newest first, ties by id) and date drill-down
+            models.Index(fields=['started_at', 'id'], name='progress_started_at_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.course.title}"
     
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.total_lesson_count:
+            self.total_lesson_count = Lesson.objects.filter(course_id=self.course_id).count()
+        super().save(*args, **kwargs)
+    
     @property
     def progress_percentage(self):
-        """Calculate completion percentage"""
-        total_lessons = self.course.lessons.count()
-        if total_lessons == 0:
+        """Calculate completion percentage from the stored counters"""
+        if self.total_lesson_count == 0:
             return 0
-        completed = self.completed_lessons.count()
-        return round((completed / total_lessons) * 100)
+        return round((self.completed_lesson_count / self.total_lesson_count) * 100)
     
     @property
     def passed(self):
         """Check if user has completed all lessons"""
         return self.progress_percentage == 100
+
+
+def completed_count_subquery():
+    """Correlated COUNT of completed-lesson links for a progress row"""
+    return _count_subquery(UserCourseProgress.completed_lessons.through.objects.all(), 'usercourseprogress')
+
+
+def total_count_subquery():
+    """Correlated COUNT of lessons in a progress row's course"""
+    counts = (
+        Lesson.objects.filter(course=OuterRef('course'))
+        .order_by()
+        .values('course')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def refresh_completed_counts(progress_ids):
+    """Recompute completed_lesson_count for the given progress rows in one UPDATE"""
+    UserCourseProgress.objects.filter(pk__in=progress_ids).update(
+        completed_lesson_count=completed_count_subquery()
+    )
+
+
+def refresh_total_counts(course_ids):
+    """Recompute total_lesson_count for every progress row of the given courses"""
+    UserCourseProgress.objects.filter(course_id__in=course_ids).update(
+        total_lesson_count=total_count_subquery()
+    )
+
+
+@receiver(m2m_changed, sender=UserCourseProgress.completed_lessons.through)
+def update_completed_lesson_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep completed_lesson_count in step with the completed_lessons relation"""
+    if action == 'pre_clear' and reverse:
+        # The affected progress rows are gone by post_clear, so remember them now
+        instance._cleared_progress_ids = list(
+            instance.completed_by_users.values_list('pk', flat=True)
+        )
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if reverse:
+        if action == 'post_clear':
+            progress_ids = instance.__dict__.pop('_cleared_progress_ids', [])
+        else:
+            progress_ids = pk_set
+        refresh_completed_counts(progress_ids)
+    elif action == 'post_add':
+        # pk_set only contains links that were actually inserted
+        UserCourseProgress.objects.filter(pk=instance.pk).update(
+            completed_lesson_count=F('completed_lesson_count') + len(pk_set)
+        )
+        instance.completed_lesson_count += len(pk_set)
+    else:
+        refresh_completed_counts([instance.pk])
+        instance.refresh_from_db(fields=['completed_lesson_count'])
+
+
+@receiver(pre_save, sender=Lesson)
+def remember_lesson_course(sender, instance, **kwargs):
+    """Note the previous course of a lesson that is being moved"""
+    instance._previous_course_id = None
+    if instance.pk and not instance._state.adding:
+        previous = Lesson.objects.filter(pk=instance.pk).values_list('course_id', flat=True).first()
+        if previous is not None and previous != instance.course_id:
+            instance._previous_course_id = previous
+
+
+@receiver(post_save, sender=Lesson)
+def update_total_lesson_count_on_save(sender, instance, created, **kwargs):
+    """Count a new lesson towards every progress row of its course"""
+    if created:
+        UserCourseProgress.objects.filter(course_id=instance.course_id).update(
+            total_lesson_count=F('total_lesson_count') + 1
+        )
+        return
+    previous = getattr(instance, '_previous_course_id', None)
+    if previous is not None:
+        # Links to a moved lesson stay in place, so both counters need a recount
+        refresh_total_counts([previous, instance.course_id])
+        refresh_completed_counts(
+            instance.completed_by_users.values_list('pk', flat=True)
+        )
+
+
+@receiver(pre_delete, sender=Lesson)
+def update_completed_lesson_count_on_delete(sender, instance, **kwargs):
+    """Drop a deleted lesson from the completed counters before its links cascade"""
+    # Clamped: a counter that already drifted low must not go negative on a PositiveIntegerField
+    UserCourseProgress.objects.filter(completed_lessons=instance).update(
+        completed_lesson_count=Greatest(F('completed_lesson_count') - 1, models.Value(0))
+    )
+
+
+@receiver(post_delete, sender=Lesson)
+def update_total_lesson_count_on_delete(sender, instance, **kwargs):
+    """Stop counting a deleted lesson towards its course's progress rows"""
+    UserCourseProgress.objects.filter(course_id=instance.course_id).update(
+        total_lesson_count=Greatest(F('total_lesson_count') - 1, models.Value(0))
+    )
+
+
+@receiver(post_save, sender=Course)
+def bump_course_version(sender, instance, created, **kwargs):
+    """Invalidate cached fragments for an edited course"""
+    if not created:
+        # In the database, like the Lesson bumps below, so concurrent saves never share a version
+        Course.objects.filter(pk=instance.pk).update(content_version=F('content_version') + 1)
+        instance.refresh_from_db(fields=['content_version'])
+
+
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def bump_course_version_for_lesson(sender, instance, **kwargs):
+    """Invalidate cached lesson data for the lesson's course (and the one it left)"""
+    course_ids = [instance.course_id]
+    previous = getattr(instance, '_previous_course_id', None)
+    if previous is not None:
+        course_ids.append(previous)
+    Course.objects.filter(pk__in=course_ids).update(content_version=F('content_version') + 1)
+
+
+@receiver(post_save, sender=Course)
+def build_course_image_variants(sender, instance, **kwargs):
+    """Generate responsive variants when a new course image is uploaded"""
+    # Cached pages and course fragments are re-rendered once the srcset markup is available
+    course_id = instance.pk
+
+    def variants_built():
+        Course.objects.filter(pk=course_id).update(content_version=F('content_version') + 1)
+        bump_version(CATALOG)
+
+    schedule_refresh_variants(instance, 'image', 'image_variants', COURSE_IMAGE_WIDTHS, on_update=variants_built)
+
+
+@receiver(post_delete, sender=Course)
+def delete_course_image_variants(sender, instance, **kwargs):
+    delete_variants(instance.image.storage, instance.image_variants)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def invalidate_catalog_cache(sender, **kwargs):
+    bump_version(CATALOG)
+
+
+@receiver(post_save, sender=UserCourseProgress)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """Drop a learner's cached pages when their progress changes"""
+    bump_version(user_namespace(instance.user_id))
+
+
+@receiver(m2m_changed, sender=UserCourseProgress.completed_lessons.through)
+def invalidate_user_cache_for_lessons(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        bump_version(user_namespace(instance.user_id))
+        return
+    user_ids = UserCourseProgress.objects.filter(pk__in=pk_set or ()).values_list('user_id', flat=True)
+    for user_id in set(user_ids):
+        bump_version(user_namespace(user_id))
@@ -0,0 +1,77 @@
+"""
+Ordered lesson sequences for previous/next navigation.
+
+A course's sequence holds only ``(id, title, order)`` for each lesson, so
+lesson bodies are never loaded to find a lesson's neighbours. Sequences
+are cached under the course's ``content_version``, which the Lesson
+signal handlers in ``courses.models`` bump on every save and delete.
+"""
+from collections import namedtuple
+
+from django.core.cache import cache
+
+from sex_education_system.instrumentation import record_cache_lookup
+
+from .models import Lesson
+
+LESSON_SEQUENCE_TIMEOUT = 60 * 60 * 24
+
+LessonEntry = namedtuple('LessonEntry', ['id', 'title', 'order'])
+
+
+class LessonSequence:
+    """Lessons of a course in display order with an id -> position index"""
+
+    def __init__(self, entries):
+        self.entries = tuple(LessonEntry(*entry) for entry in entries)
+        self.positions = {entry.id: index for index, entry in enumerate(self.entries)}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def position(self, lesson_id):
+        """Zero-based position of the lesson, or None if it is not in the course"""
+        return self.positions.get(lesson_id)
+
+    def previous(self, lesson_id):
+        index = self.positions.get(lesson_id)
+        if index is None or index == 0:
+            return None
+        return self.entries[index - 1]
+
+    def next(self, lesson_id):
+        index = self.positions.get(lesson_id)
+        if index is None or index == len(self.entries) - 1:
+            return None
+        return self.entries[index + 1]
+
+
+def lesson_sequence_cache_key(course):
+    return f'lesson-sequence:{course.pk}:{course.content_version}'
+
+
+def _sequence_queryset(course):
+    # Same ordering as Lesson.Meta.ordering within a single course
+    return Lesson.objects.filter(course=course).order_by('order', 'id').values_list('id', 'title', 'order')
+
+
+def get_lesson_sequence(course):
+    """Return the cached lesson sequence for ``course``, building it on a miss"""
+    key = lesson_sequence_cache_key(course)
+    entries = cache.get(key)
+    record_cache_lookup(entries is not None)
+    if entries is None:
+        entries = tuple(_sequence_queryset(course))
+        cache.set(key, entries, LESSON_SEQUENCE_TIMEOUT)
+    return LessonSequence(entries)
+
+
+async def aget_lesson_sequence(course):
+    """Async variant of get_lesson_sequence()"""
+    key = lesson_sequence_cache_key(course)
+    entries = await cache.aget(key)
+    record_cache_lookup(entries is not None)
+    if entries is None:
+        entries = tuple([entry async for entry in _sequence_queryset(course)])
+        await cache.aset(key, entries, LESSON_SEQUENCE_TIMEOUT)
+    return LessonSequence(entries)
@@ -0,0 +1,54 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+register = template.Library()
+
+
+def _srcset(storage, variants, key):
+    return ', '.join(f'{storage.url(variant[key])} {variant["width"]}w' for variant in variants)
+
+
+@register.simple_tag
+def responsive_image(field_file, variants, alt='', sizes='100vw', css_class='', loading='lazy'):
+    """
+    Render an uploaded image as a ``<picture>`` with WebP and fallback srcsets.
+
+    ``variants`` is the JSON written by ``sex_education_system.images``.
+    Images without variants (not processed yet), or whose variants belong
+    to a previous upload, fall back to a plain ``<img>`` of the original.
+
+    Usage: {% responsive_image course.image course.image_variants alt=course.title sizes="360px" %}
+    """
+    if not field_file:
+        return ''
+    variants = variants or {}
+    if variants.get('source') != field_file.name:
+        # Left over from a replaced upload; those files are deleted when the new ones are built
+        variants = {}
+    variants = variants.get('variants') or []
+    attrs = {'alt': alt, 'loading': loading, 'decoding': 'async'}
+    if css_class:
+        attrs['class'] = css_class
+
+    if not variants:
+        return format_html('<img src="{}"{}>', field_file.url, _attributes(attrs))
+
+    storage = field_file.storage
+    largest = variants[-1]
+    attrs.update({
+        'srcset': _srcset(storage, variants, 'fallback'),
+        'sizes': sizes,
+        'width': largest['width'],
+        'height': largest['height'],
+    })
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}"><img src="{}"{}></picture>',
+        _srcset(storage, variants, 'webp'),
+        sizes,
+        storage.url(largest['fallback']),
+        _attributes(attrs),
+    )
+
+
+def _attributes(attrs):
+    return format_html_join('', ' {}="{}"', attrs.items())
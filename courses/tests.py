@@ -1,3 +1,159 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from content_management.synthetic import seed_dataset
+
+from .models import Lesson, UserCourseProgress
+from .video import AVAILABLE
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'course-tests'}},
+    STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+    SECURE_SSL_REDIRECT=False,
+)
+class CachedListPagesTests(TestCase):
+    """Cached list pages must not leak one user's header to another"""
+
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user('alice_student', 'alice@example.com', 'pw')
+        self.bob = User.objects.create_user('bob_student', 'bob@example.com', 'pw')
+
+    def assert_own_header(self, url_name):
+        url = reverse(url_name)
+        self.client.force_login(self.alice)
+        self.assertContains(self.client.get(url), 'alice_student')
+        self.client.force_login(self.bob)
+        response = self.client.get(url)
+        self.assertContains(response, 'bob_student')
+        self.assertNotContains(response, 'alice_student')
+
+    def test_course_list(self):
+        self.assert_own_header('courses:list')
+
+    def test_quiz_list(self):
+        self.assert_own_header('quizzes:list')
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'course-tests'}},
+    STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+    SECURE_SSL_REDIRECT=False,
+    INSTRUMENTATION_ENABLED=True,
+    SERVER_TIMING_PUBLIC=False,
+)
+class ServerTimingTests(TestCase):
+    """Server-Timing reveals backend timings, so only staff get it outside DEBUG"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_learner_gets_no_header(self):
+        self.client.force_login(User.objects.create_user('learner', 'learner@example.com', 'pw'))
+        self.assertNotIn('Server-Timing', self.client.get(reverse('courses:list')).headers)
+
+    def test_staff_gets_header(self):
+        self.client.force_login(User.objects.create_user('editor', 'editor@example.com', 'pw', is_staff=True))
+        self.assertIn('db;dur=', self.client.get(reverse('courses:list')).headers['Server-Timing'])
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'course-tests'}},
+    STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+    SECURE_SSL_REDIRECT=False,
+)
+class ChangelistQueryTests(TestCase):
+    """Changelist columns are loaded with the page, so the query count does not grow with the rows shown"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(users=12, courses=3, lessons=2, quizzes=3, questions=2, prefix='course-tests')
+        cls.admin = User.objects.create_superuser('course_admin', 'admin@example.com', 'pw')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def assert_changelist_queries(self, url_name, num, ordering=None):
+        with self.assertNumQueries(num):
+            response = self.client.get(reverse(url_name), {'o': ordering} if ordering else {})
+        self.assertEqual(response.status_code, 200)
+
+    def test_course_changelist(self):
+        self.assert_changelist_queries('admin:courses_course_changelist', 5)
+
+    def test_course_changelist_sorted_by_annotation(self):
+        # Column 4 is enrolled_count
+        self.assert_changelist_queries('admin:courses_course_changelist', 5, ordering='4')
+
+    def test_lesson_changelist(self):
+        self.assert_changelist_queries('admin:courses_lesson_changelist', 6)
+
+    def test_user_course_progress_changelist(self):
+        self.assert_changelist_queries('admin:courses_usercourseprogress_changelist', 6)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'course-tests'}},
+    STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+    SECURE_SSL_REDIRECT=False,
+)
+class VideoDiagnosticTests(TestCase):
+    """The diagnostic page embeds a player per lesson, so it is paginated"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(users=1, courses=3, lessons=6, quizzes=0, questions=0, prefix='video-tests')
+        Lesson.objects.update(video_url='https://www.youtube.com/watch?v=dQw4w9WgXcQ')
+        cls.admin = User.objects.create_superuser('video_admin', 'admin@example.com', 'pw')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_page_is_bounded(self):
+        response = self.client.get(reverse('courses:video_diagnostic'))
+        self.assertEqual(len(response.context['lessons']), 12)
+        self.assertTrue(response.context['page'].has_next)
+
+    def test_status_filter_accepts_any_choice(self):
+        # No lesson has been probed, yet filtering on a known status must still apply
+        response = self.client.get(reverse('courses:video_diagnostic'), {'status': AVAILABLE})
+        self.assertEqual(response.context['selected_status'], AVAILABLE)
+        self.assertEqual(len(response.context['lessons']), 0)
+
+    def test_unknown_status_is_ignored(self):
+        response = self.client.get(reverse('courses:video_diagnostic'), {'status': 'bogus'})
+        self.assertIsNone(response.context['selected_status'])
+        self.assertEqual(len(response.context['lessons']), 12)
+
+
+class LessonCounterTests(TestCase):
+    """Deleting a lesson never drives a progress counter below zero"""
+
+    def test_decrement_is_clamped(self):
+        seed_dataset(users=1, courses=1, lessons=2, quizzes=0, questions=0, prefix='counter-tests')
+        lesson = Lesson.objects.first()
+        progress = UserCourseProgress.objects.create(
+            user=User.objects.create_user('counter_student'), course=lesson.course,
+        )
+        progress.completed_lessons.add(lesson)
+        # Counters that drifted below the truth, e.g. rows written before the counters existed
+        UserCourseProgress.objects.filter(pk=progress.pk).update(completed_lesson_count=0, total_lesson_count=0)
+        lesson.delete()
+        progress.refresh_from_db()
+        self.assertEqual((progress.completed_lesson_count, progress.total_lesson_count), (0, 0))
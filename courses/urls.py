@@ -1,13 +1,20 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# Read-heavy views have async variants for ASGI deployments
+if settings.ASYNC_VIEWS:
+    from . import async_views as read_views
+else:
+    read_views = views
+
 app_name = 'courses'
 
 urlpatterns = [
     # Public views
-    path('', views.course_list_view, name='list'),
-    path('<int:course_id>/', views.course_detail_view, name='detail'),
-    path('<int:course_id>/lesson/<int:lesson_id>/', views.lesson_view, name='lesson'),
+    path('', read_views.course_list_view, name='list'),
+    path('<int:course_id>/', read_views.course_detail_view, name='detail'),
+    path('<int:course_id>/lesson/<int:lesson_id>/', read_views.lesson_view, name='lesson'),
     path('<int:course_id>/lesson/<int:lesson_id>/complete/', views.mark_lesson_complete, name='mark_complete'),
     
     # Content management views (staff only)
@@ -0,0 +1,110 @@
+"""
+Video URL parsing for lesson videos.
+
+Lessons store the provider, video id, start offset and embed URL parsed
+from ``video_url`` when they are saved, so pages never parse URLs while
+rendering. Every pattern is compiled once at import.
+"""
+import re
+from collections import namedtuple
+from urllib.parse import parse_qs, urlsplit
+
+YOUTUBE = 'youtube'
+VIMEO = 'vimeo'
+
+PROVIDER_CHOICES = [
+    (YOUTUBE, 'YouTube'),
+    (VIMEO, 'Vimeo'),
+]
+
+# Availability reported by the probe backend (see courses.video_probe)
+UNCHECKED = 'unchecked'
+AVAILABLE = 'ok'
+UNAVAILABLE = 'unavailable'
+PROBE_ERROR = 'error'
+UNSUPPORTED = 'unsupported'
+
+STATUS_CHOICES = [
+    (UNCHECKED, 'Not checked yet'),
+    (AVAILABLE, 'Available'),
+    (UNAVAILABLE, 'Unavailable'),
+    (PROBE_ERROR, 'Check failed'),
+    (UNSUPPORTED, 'Unsupported URL'),
+]
+
+_YOUTUBE_HOST = re.compile(r'^(?:www\.|m\.|music\.)?(?:youtube\.com|youtube-nocookie\.com)$')
+_YOUTUBE_PATH = re.compile(r'^/(?:embed|v|shorts|live)/([A-Za-z0-9_-]{6,})')
+_YOUTU_BE_PATH = re.compile(r'^/([A-Za-z0-9_-]{6,})')
+_YOUTUBE_ID = re.compile(r'^[A-Za-z0-9_-]{6,}$')
+_VIMEO_HOST = re.compile(r'^(?:www\.|player\.)?vimeo\.com$')
+_VIMEO_PATH = re.compile(r'^/(?:video/|channels/[\w-]+/|groups/[\w-]+/videos/)?(\d+)(?:/|$)')
+_TIMESTAMP = re.compile(r'^(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s?)?$')
+
+ParsedVideo = namedtuple('ParsedVideo', ['provider', 'video_id', 'start', 'embed_url'])
+
+
+def parse_timestamp(value):
+    """Seconds from a start offset such as ``90``, ``90s`` or ``1m30s``"""
+    match = _TIMESTAMP.match(value or '')
+    if not match or not any(match.groups()):
+        return 0
+    hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def youtube_embed_url(video_id, start=0):
+    # Privacy-enhanced mode avoids tracking cookies and some embedding errors
+    url = f'https://www.youtube-nocookie.com/embed/{video_id}'
+    return f'{url}?start={start}' if start else url
+
+
+def vimeo_embed_url(video_id, start=0):
+    url = f'https://player.vimeo.com/video/{video_id}'
+    return f'{url}#t={start}s' if start else url
+
+
+def watch_url(provider, video_id, start=0):
+    """Canonical page URL for watching a parsed video on its provider's site"""
+    if provider == YOUTUBE:
+        url = f'https://www.youtube.com/watch?v={video_id}'
+        return f'{url}&t={start}s' if start else url
+    if provider == VIMEO:
+        url = f'https://vimeo.com/{video_id}'
+        return f'{url}#t={start}s' if start else url
+    return ''
+
+
+def parse_video_url(url):
+    """Parse a YouTube or Vimeo URL, or return None for anything else"""
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    query = parse_qs(parts.query)
+    fragment = parse_qs(parts.fragment)
+
+    if _YOUTUBE_HOST.match(host) or host == 'youtu.be':
+        if host == 'youtu.be':
+            match = _YOUTU_BE_PATH.match(parts.path)
+            video_id = match.group(1) if match else None
+        elif parts.path == '/watch':
+            video_id = query.get('v', [None])[0]
+            if video_id and not _YOUTUBE_ID.match(video_id):
+                video_id = None
+        else:
+            match = _YOUTUBE_PATH.match(parts.path)
+            video_id = match.group(1) if match else None
+        if not video_id:
+            return None
+        start = parse_timestamp((query.get('t') or query.get('start') or fragment.get('t') or [''])[0])
+        return ParsedVideo(YOUTUBE, video_id, start, youtube_embed_url(video_id, start))
+
+    if _VIMEO_HOST.match(host):
+        match = _VIMEO_PATH.match(parts.path)
+        if not match:
+            return None
+        video_id = match.group(1)
+        start = parse_timestamp((fragment.get('t') or query.get('t') or [''])[0])
+        return ParsedVideo(VIMEO, video_id, start, vimeo_embed_url(video_id, start))
+
+    return None
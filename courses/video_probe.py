@@ -0,0 +1,88 @@
+"""
+Availability checks for lesson videos.
+
+A probe backend asks the video provider whether a video can be embedded,
+using the provider's oEmbed endpoint: 200 means available, 401/403/404
+mean private, removed or not embeddable. Results are stored on the
+lesson (``video_status`` and ``video_checked_at``) and reused until
+``VIDEO_STATUS_TTL`` expires, so pages never call out to the provider.
+
+The backend class is configured with ``VIDEO_PROBE_BACKEND``, and the
+endpoints with ``VIDEO_OEMBED_ENDPOINTS``, so a local stub server can
+stand in for the real providers.
+"""
+import http.client
+import json
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .video import AVAILABLE, PROBE_ERROR, UNAVAILABLE, UNSUPPORTED, watch_url
+
+ProbeResult = namedtuple('ProbeResult', ['status', 'detail'])
+
+UNAVAILABLE_CODES = {400, 401, 403, 404}
+
+
+class OEmbedProbe:
+    """Check videos against each provider's oEmbed endpoint"""
+
+    def __init__(self, endpoints=None, timeout=None):
+        self.endpoints = endpoints or settings.VIDEO_OEMBED_ENDPOINTS
+        self.timeout = timeout or settings.VIDEO_PROBE_TIMEOUT
+
+    def probe(self, provider, video_id, start=0):
+        endpoint = self.endpoints.get(provider)
+        if not endpoint:
+            return ProbeResult(UNSUPPORTED, f'No oEmbed endpoint configured for "{provider}"')
+        query = urlencode({'url': watch_url(provider, video_id), 'format': 'json'})
+        request = Request(f'{endpoint}?{query}', headers={'User-Agent': 'sex-education-video-check/1.0'})
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                payload = json.loads(response.read() or b'{}')
+            # Any 200 means embeddable; the title is only informative
+            title = payload.get('title') if isinstance(payload, dict) else None
+            return ProbeResult(AVAILABLE, str(title or '')[:200])
+        except HTTPError as exc:
+            status = UNAVAILABLE if exc.code in UNAVAILABLE_CODES else PROBE_ERROR
+            return ProbeResult(status, f'HTTP {exc.code}')
+        except (URLError, http.client.HTTPException, TimeoutError, OSError, ValueError) as exc:
+            reason = getattr(exc, 'reason', exc)
+            return ProbeResult(PROBE_ERROR, str(reason)[:200])
+
+
+def get_probe_backend(**kwargs):
+    return import_string(settings.VIDEO_PROBE_BACKEND)(**kwargs)
+
+
+def due_for_check(lessons, ttl=None):
+    """Lessons whose video has never been checked, failed to check, or whose check expired"""
+    ttl = settings.VIDEO_STATUS_TTL if ttl is None else ttl
+    expired = timezone.now() - timedelta(seconds=ttl)
+    return lessons.exclude(video_provider='').filter(
+        Q(video_checked_at__isnull=True) | Q(video_checked_at__lt=expired) | Q(video_status=PROBE_ERROR)
+    )
+
+
+def probe_lessons(lessons, backend=None, workers=None):
+    """Probe lessons concurrently, yielding each lesson with its status fields updated"""
+    backend = backend or get_probe_backend()
+    workers = workers or settings.VIDEO_PROBE_WORKERS
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            lambda lesson: backend.probe(lesson.video_provider, lesson.video_id, lesson.video_start),
+            lessons,
+        )
+        for lesson, result in zip(lessons, results):
+            lesson.video_status = result.status
+            lesson.video_status_detail = result.detail
+            lesson.video_checked_at = timezone.now()
+            yield lesson
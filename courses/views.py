@@ -3,26 +3,34 @@ from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
+from django.db.models import Count
 from django.utils import timezone
+from sex_education_system.caching import cache_per_role
+from sex_education_system.pagination import keyset_paginate
 from .models import Course, Lesson, UserCourseProgress
 from .forms import CourseForm, LessonForm
+from .sequence import get_lesson_sequence
 
 
 @login_required
+@cache_per_role('course_list', per_user=True)
 def course_list_view(request):
     """Display all published courses (excluding archived)"""
-    courses = Course.objects.filter(is_published=True, is_archived=False)
-    return render(request, 'pages/course_list.html', {'courses': courses})
+    courses = Course.objects.with_stats().filter(is_published=True, is_archived=False)
+    page = keyset_paginate(request, courses, '-created_at')
+    return render(request, 'pages/course_list.html', {'courses': page, 'page': page})
 
 
 @login_required
+@cache_per_role('course_detail', per_user=True)
 def course_detail_view(request, course_id):
     """Display course details and lessons"""
     # Staff can view archived courses, regular users cannot
+    courses = Course.objects.with_stats()
     if request.user.is_staff:
-        course = get_object_or_404(Course, id=course_id)
+        course = get_object_or_404(courses, id=course_id)
     else:
-        course = get_object_or_404(Course, id=course_id, is_published=True, is_archived=False)
+        course = get_object_or_404(courses, id=course_id, is_published=True, is_archived=False)
     lessons = course.lessons.all()
     
     # Get or create user progress if authenticated
@@ -53,11 +61,10 @@ def lesson_view(request, course_id, lesson_id):
         course=course
     )
     
-    # Get previous and next lessons
-    all_lessons = list(course.lessons.all())
-    current_index = all_lessons.index(lesson)
-    previous_lesson = all_lessons[current_index - 1] if current_index > 0 else None
-    next_lesson = all_lessons[current_index + 1] if current_index < len(all_lessons) - 1 else None
+    # Get previous and next lessons from the cached lesson sequence
+    sequence = get_lesson_sequence(course)
+    previous_lesson = sequence.previous(lesson.id)
+    next_lesson = sequence.next(lesson.id)
     
     # Check if lesson is completed
     is_completed = progress.completed_lessons.filter(id=lesson_id).exists()
@@ -77,7 +84,7 @@ def lesson_view(request, course_id, lesson_id):
 def mark_lesson_complete(request, course_id, lesson_id):
     """Mark a lesson as complete"""
     course = get_object_or_404(Course, id=course_id)
-    lesson = get_object_or_404(Lesson, id=lesson_id, course=course)
+    lesson = get_object_or_404(Lesson.objects.only('id', 'title', 'course_id'), id=lesson_id, course=course)
     
     progress, created = UserCourseProgress.objects.get_or_create(
         user=request.user,
@@ -93,14 +100,12 @@ def mark_lesson_complete(request, course_id, lesson_id):
     if progress.progress_percentage == 100 and not progress.completed:
         progress.completed = True
         progress.completed_at = timezone.now()
-        progress.save()
+        progress.save(update_fields=['completed', 'completed_at'])
         messages.success(request, f'Congratulations! You completed the course "{course.title}"!')
     
     # Redirect to next lesson or back to course
-    all_lessons = list(course.lessons.all())
-    current_index = all_lessons.index(lesson)
-    if current_index < len(all_lessons) - 1:
-        next_lesson = all_lessons[current_index + 1]
+    next_lesson = get_lesson_sequence(course).next(lesson.id)
+    if next_lesson:
         return redirect('courses:lesson', course_id=course_id, lesson_id=next_lesson.id)
     else:
         return redirect('courses:detail', course_id=course_id)
@@ -256,13 +261,31 @@ def restore_course(request, course_id):
 @staff_member_required
 def archived_courses_view(request):
     """Display all archived courses (staff only)"""
-    courses = Course.objects.filter(is_archived=True)
-    return render(request, 'pages/archived_courses.html', {'courses': courses})
+    courses = Course.objects.with_stats().filter(is_archived=True)
+    page = keyset_paginate(request, courses, '-created_at')
+    return render(request, 'pages/archived_courses.html', {'courses': page, 'page': page})
 
 
 @staff_member_required
 def video_diagnostic_view(request):
-    """Diagnostic page to view all video URLs and their conversions (staff only)"""
+    """Diagnostic page to view all video URLs and their last availability check (staff only)"""
     lessons = Lesson.objects.filter(video_url__isnull=False).exclude(video_url='')
-    return render(request, 'pages/video_diagnostic.html', {'lessons': lessons})
+    status_choices = Lesson._meta.get_field('video_status').choices
+    status_counts = dict(lessons.order_by().values_list('video_status').annotate(total=Count('pk')))
+    status_summary = [(value, label, status_counts.get(value, 0)) for value, label in status_choices]
+
+    status = request.GET.get('status')
+    if status in dict(status_choices):
+        lessons = lessons.filter(video_status=status)
+    else:
+        status = None
+
+    # Every lesson on the page embeds its video, so the page must stay bounded
+    page = keyset_paginate(request, lessons.select_related('course'), '-created_at')
+    return render(request, 'pages/video_diagnostic.html', {
+        'lessons': page,
+        'page': page,
+        'status_summary': status_summary,
+        'selected_status': status,
+    })
 
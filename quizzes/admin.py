@@ -1,4 +1,8 @@
 from django.contrib import admin
+
+from sex_education_system.admin_mixins import (
+    AnnotatedAdminMixin, LargeTableAdminMixin, annotated_column, related_id_filter,
+)
 from .models import Quiz, Question, Answer, UserQuizAttempt
 
 
@@ -18,10 +22,11 @@ class QuestionInline(admin.StackedInline):
 
 
 @admin.register(Quiz)
-class QuizAdmin(admin.ModelAdmin):
+class QuizAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     """Admin interface for Quiz"""
     list_display = ('title', 'course', 'question_count', 'passing_score', 'time_limit_minutes', 'is_active', 'created_at')
     list_filter = ('is_active', 'course', 'created_at')
+    list_select_related = ('course',)
     search_fields = ('title', 'description')
     inlines = [QuestionInline]
     readonly_fields = ('created_at', 'updated_at')
@@ -39,12 +44,18 @@ class QuizAdmin(admin.ModelAdmin):
         }),
     )
 
+    question_count = annotated_column('num_questions', 'Questions')
+
+    def annotate_queryset(self, queryset):
+        return queryset.with_stats()
+
 
 @admin.register(Question)
-class QuestionAdmin(admin.ModelAdmin):
+class QuestionAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     """Admin interface for Question"""
     list_display = ('quiz', 'text_preview', 'order', 'created_at')
     list_filter = ('quiz', 'created_at')
+    list_select_related = ('quiz',)
     search_fields = ('text', 'quiz__title')
     inlines = [AnswerInline]
     ordering = ('quiz', 'order')
@@ -55,10 +66,11 @@ class QuestionAdmin(admin.ModelAdmin):
 
 
 @admin.register(Answer)
-class AnswerAdmin(admin.ModelAdmin):
+class AnswerAdmin(AnnotatedAdminMixin, admin.ModelAdmin):
     """Admin interface for Answer"""
     list_display = ('question_preview', 'text_preview', 'is_correct', 'created_at')
     list_filter = ('is_correct', 'created_at')
+    list_select_related = ('question',)
     search_fields = ('text', 'question__text')
     
     def question_preview(self, obj):
@@ -71,19 +83,22 @@ class AnswerAdmin(admin.ModelAdmin):
 
 
 @admin.register(UserQuizAttempt)
-class UserQuizAttemptAdmin(admin.ModelAdmin):
+class UserQuizAttemptAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     """Admin interface for UserQuizAttempt"""
     list_display = ('user', 'quiz', 'score', 'passed', 'time_taken_minutes', 'attempted_at')
-    list_filter = ('attempted_at', 'quiz')
-    search_fields = ('user__username', 'quiz__title')
-    readonly_fields = ('attempted_at', 'passed', 'correct_count', 'incorrect_count')
+    list_filter = ('passed', related_id_filter('quiz'))
+    list_select_related = ('user', 'quiz')
+    date_hierarchy = 'attempted_at'
+    autocomplete_fields = ('user', 'quiz')
+    search_fields = ('user__username',)
+    readonly_fields = ('attempted_at', 'passed', 'correct_count', 'question_total', 'incorrect_count')
     
     fieldsets = (
         ('Attempt Information', {
             'fields': ('user', 'quiz', 'score', 'time_taken_minutes')
         }),
         ('Results', {
-            'fields': ('passed', 'correct_count', 'incorrect_count')
+            'fields': ('passed', 'correct_count', 'question_total', 'incorrect_count')
         }),
         ('Details', {
             'fields': ('answers', 'attempted_at'),
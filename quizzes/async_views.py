@@ -0,0 +1,68 @@
+"""
+Async variants of the read-heavy quiz views.
+
+These are routed instead of their counterparts in ``views.py`` when
+``settings.ASYNC_VIEWS`` is enabled and the site is served through ASGI.
+All data is loaded with the async ORM before rendering, because template
+rendering must not trigger lazy queries inside the event loop.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render
+
+from courses.async_views import aget_object_or_404
+from sex_education_system.caching import cache_per_role
+from sex_education_system.pagination import keyset_paginate
+from .models import Quiz, UserQuizAttempt
+from .views import ATTEMPTS_PER_PAGE, build_results
+
+
+@login_required
+@cache_per_role('quiz_list', per_user=True)
+async def quiz_list_view(request):
+    """Display all active quizzes"""
+    request.user = await request.auser()
+    quizzes = Quiz.objects.with_stats().filter(is_active=True)
+    page = await sync_to_async(keyset_paginate)(request, quizzes, '-created_at')
+    return render(request, 'pages/quiz_list.html', {'quizzes': page, 'page': page})
+
+
+@login_required
+async def quiz_detail_view(request, quiz_id):
+    """Display quiz details"""
+    user = request.user = await request.auser()
+    quiz = await aget_object_or_404(Quiz.objects.all(), id=quiz_id)
+    
+    attempts = UserQuizAttempt.objects.filter(user=user, quiz=quiz)
+    user_attempts = await sync_to_async(keyset_paginate)(
+        request, attempts, '-attempted_at', per_page_choices=ATTEMPTS_PER_PAGE
+    )
+    if user_attempts and not user_attempts.has_previous:
+        latest_attempt = user_attempts[0]
+    else:
+        latest_attempt = await attempts.order_by('-attempted_at', '-pk').afirst()
+    
+    context = {
+        'quiz': quiz,
+        'questions_count': await quiz.questions.acount(),
+        'user_attempts': user_attempts,
+        'latest_attempt': latest_attempt,
+    }
+    return render(request, 'pages/quiz_detail.html', context)
+
+
+@login_required
+async def quiz_results_view(request, quiz_id, attempt_id):
+    """Display quiz results"""
+    user = request.user = await request.auser()
+    quiz = await aget_object_or_404(Quiz.objects.all(), id=quiz_id)
+    attempt = await aget_object_or_404(UserQuizAttempt.objects.all(), id=attempt_id, user=user, quiz=quiz)
+    
+    questions = [question async for question in quiz.questions.prefetch_related('answers')]
+    
+    context = {
+        'quiz': quiz,
+        'attempt': attempt,
+        'results': build_results(attempt, questions),
+    }
+    return render(request, 'pages/quiz_results.html', context)
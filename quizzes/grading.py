@@ -0,0 +1,97 @@
+"""
+Answer keys for grading quiz submissions in memory.
+
+An answer key maps every question of a quiz to the ids of its correct
+answers. It is built with a single query and cached under the quiz's
+``content_version``, which the signal handlers in ``quizzes.models`` bump
+whenever a question or answer changes.
+"""
+from django.core.cache import cache
+from django.db.models import FilteredRelation, Q
+
+from sex_education_system.instrumentation import record_cache_lookup
+
+from .models import Question
+
+ANSWER_KEY_TIMEOUT = 60 * 60 * 24
+
+
+class Grade:
+    """Outcome of grading one submission against an answer key"""
+
+    def __init__(self, answers, correct_question_ids, total):
+        self.answers = answers
+        self.correct_question_ids = correct_question_ids
+        self.total = total
+
+    @property
+    def correct_count(self):
+        return len(self.correct_question_ids)
+
+    @property
+    def score(self):
+        if self.total == 0:
+            return 0
+        return round((self.correct_count / self.total) * 100)
+
+
+class AnswerKey:
+    """Question ids in quiz order with the set of correct answer ids for each"""
+
+    def __init__(self, entries):
+        self.entries = tuple(entries)
+        self.correct = {question_id: frozenset(answer_ids) for question_id, answer_ids in self.entries}
+
+    @property
+    def question_ids(self):
+        return [question_id for question_id, _ in self.entries]
+
+    def is_correct(self, question_id, answer_id):
+        try:
+            return int(answer_id) in self.correct.get(question_id, ())
+        except (TypeError, ValueError):
+            return False
+
+    def grade(self, data):
+        """Grade POST-style ``data`` holding ``question_<id>`` = answer id"""
+        answers = {}
+        correct_question_ids = []
+        for question_id, _ in self.entries:
+            answer_id = data.get(f'question_{question_id}')
+            if answer_id:
+                answers[str(question_id)] = answer_id
+                if self.is_correct(question_id, answer_id):
+                    correct_question_ids.append(question_id)
+        return Grade(answers, correct_question_ids, len(self.entries))
+
+
+def build_answer_key(quiz):
+    """Load the answer key for ``quiz`` with one LEFT JOIN query"""
+    rows = (
+        Question.objects.filter(quiz=quiz)
+        .annotate(correct=FilteredRelation('answers', condition=Q(answers__is_correct=True)))
+        .order_by('order', 'id')
+        .values_list('id', 'correct__id')
+    )
+    entries = {}
+    for question_id, answer_id in rows:
+        answer_ids = entries.setdefault(question_id, [])
+        if answer_id is not None:
+            answer_ids.append(answer_id)
+    return AnswerKey((question_id, tuple(answer_ids)) for question_id, answer_ids in entries.items())
+
+
+def answer_key_cache_key(quiz):
+    return f'quiz-answer-key:{quiz.pk}:{quiz.content_version}'
+
+
+def get_answer_key(quiz):
+    """Return the cached answer key for ``quiz``, building it on a miss"""
+    key = answer_key_cache_key(quiz)
+    entries = cache.get(key)
+    record_cache_lookup(entries is not None)
+    if entries is None:
+        answer_key = build_answer_key(quiz)
+        cache.set(key, answer_key.entries, ANSWER_KEY_TIMEOUT)
+        return answer_key
+    return AnswerKey(entries)
@@ -0,0 +1,62 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from quizzes.grading import answer_key_cache_key
+from quizzes.models import Answer, Question, Quiz
+from quizzes.views import take_quiz_view
+
+
+class Command(BaseCommand):
+    help = 'Measure queries and time spent grading quiz submissions of increasing size'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[10, 40, 160],
+            help='Question counts to benchmark',
+        )
+        parser.add_argument(
+            '--answers', type=int, default=4,
+            help='Answer choices per question',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{"questions":>10} {"queries (cold)":>15} {"queries (warm)":>15} {"ms (warm)":>10}')
+        # Everything is created inside a transaction that is always rolled back
+        with transaction.atomic():
+            for size in options['sizes']:
+                cold, warm, elapsed = self.measure(size, options['answers'])
+                self.stdout.write(f'{size:>10} {cold:>15} {warm:>15} {elapsed:>10.2f}')
+            transaction.set_rollback(True)
+
+    def measure(self, size, answers_per_question):
+        quiz = Quiz.objects.create(title=f'Benchmark quiz ({size})', description='Benchmark')
+        questions = Question.objects.bulk_create(
+            Question(quiz=quiz, text=f'Question {i}', order=i) for i in range(size)
+        )
+        answers = Answer.objects.bulk_create(
+            Answer(question=question, text=f'Answer {i}', is_correct=(i == 0))
+            for question in questions
+            for i in range(answers_per_question)
+        )
+        quiz.refresh_from_db()
+        data = {f'question_{answer.question_id}': answer.pk for answer in answers[::answers_per_question]}
+
+        cache.delete(answer_key_cache_key(quiz))
+        cold = self.submit(quiz, data, f'bench_cold_{size}')[0]
+        warm, elapsed = self.submit(quiz, data, f'bench_warm_{size}')
+        return cold, warm, elapsed
+
+    def submit(self, quiz, data, username):
+        request = RequestFactory().post(f'/quizzes/{quiz.pk}/submit/', data)
+        request.user = User.objects.create_user(username)
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            take_quiz_view(request, quiz_id=quiz.pk)
+            elapsed = (time.perf_counter() - started) * 1000
+        return len(queries), elapsed
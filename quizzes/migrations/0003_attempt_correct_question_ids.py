@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:21
+
+from django.db import migrations, models
+
+
+def backfill_correct_question_ids(apps, schema_editor):
+    UserQuizAttempt = apps.get_model('quizzes', 'UserQuizAttempt')
+    Answer = apps.get_model('quizzes', 'Answer')
+
+    correct_answers = {}
+    for question_id, answer_id in Answer.objects.filter(is_correct=True).values_list('question_id', 'id'):
+        correct_answers.setdefault(question_id, set()).add(answer_id)
+
+    batch = []
+    for attempt in UserQuizAttempt.objects.only('id', 'answers').iterator(chunk_size=2000):
+        correct = []
+        for question_id, answer_id in (attempt.answers or {}).items():
+            try:
+                if int(answer_id) in correct_answers.get(int(question_id), ()):
+                    correct.append(int(question_id))
+            except (TypeError, ValueError):
+                continue
+        attempt.correct_question_ids = correct
+        batch.append(attempt)
+        if len(batch) >= 2000:
+            UserQuizAttempt.objects.bulk_update(batch, ['correct_question_ids'])
+            batch = []
+    if batch:
+        UserQuizAttempt.objects.bulk_update(batch, ['correct_question_ids'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0002_quiz_content_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userquizattempt',
+            name='correct_question_ids',
+            field=models.JSONField(blank=True, help_text='Ids of the questions answered correctly, recorded at grading time', null=True),
+        ),
+        migrations.RunPython(backfill_correct_question_ids, migrations.RunPython.noop),
+    ]
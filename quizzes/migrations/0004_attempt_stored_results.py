@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0003_attempt_correct_question_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userquizattempt',
+            name='correct_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userquizattempt',
+            name='passed',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='userquizattempt',
+            name='question_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def backfill_attempt_results(apps, schema_editor):
+    Quiz = apps.get_model('quizzes', 'Quiz')
+    UserQuizAttempt = apps.get_model('quizzes', 'UserQuizAttempt')
+
+    quizzes = {
+        quiz['id']: quiz
+        for quiz in Quiz.objects.annotate(num_questions=Count('questions')).values('id', 'passing_score', 'num_questions')
+    }
+
+    batch = []
+    fields = ['correct_count', 'question_total', 'passed']
+    attempts = UserQuizAttempt.objects.only('id', 'quiz_id', 'score', 'correct_question_ids')
+    for attempt in attempts.iterator(chunk_size=2000):
+        quiz = quizzes[attempt.quiz_id]
+        attempt.correct_count = len(attempt.correct_question_ids or ())
+        attempt.question_total = max(quiz['num_questions'], attempt.correct_count)
+        attempt.passed = attempt.score >= quiz['passing_score']
+        batch.append(attempt)
+        if len(batch) >= 2000:
+            UserQuizAttempt.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        UserQuizAttempt.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0004_attempt_stored_results'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_attempt_results, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0005_backfill_attempt_results'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userquizattempt',
+            index=models.Index(fields=['attempted_at', 'id'], name='attempt_attempted_at_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0009_course_course_created_at_idx'),
+        ('quizzes', '0006_userquizattempt_attempt_attempted_at_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['created_at', 'id'], name='quiz_created_at_idx'),
+        ),
+    ]
@@ -1,6 +1,19 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
 from django.contrib.auth.models import User
-from courses.models import Course
+from courses.models import Course, _count_subquery
+from sex_education_system.caching import CATALOG, bump_version
+
+
+class QuizQuerySet(models.QuerySet):
+    """QuerySet helpers for quiz listings"""
+
+    def with_stats(self):
+        """Annotate the question count in the same SELECT"""
+        # A correlated subquery rather than JOIN + GROUP BY, so a LIMITed page only counts its own rows
+        return self.annotate(num_questions=_count_subquery(Question.objects.all(), 'quiz'))
 
 
 class Quiz(models.Model):
@@ -13,16 +26,26 @@ class Quiz(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # Bumped whenever a question or answer changes; keys the cached answer key
+    content_version = models.PositiveIntegerField(default=0, editable=False)
+    
+    objects = QuizQuerySet.as_manager()
     
     class Meta:
         ordering = ['-created_at']
         verbose_name_plural = 'Quizzes'
+        indexes = [
+            # Keyset pagination of the quiz lists (see sex_education_system.pagination)
+            models.Index(fields=['created_at', 'id'], name='quiz_created_at_idx'),
+        ]
     
     def __str__(self):
         return self.title
     
     @property
     def question_count(self):
+        if hasattr(self, 'num_questions'):
+            return self.num_questions
         return self.questions.count()
     
     @property
@@ -66,25 +89,66 @@ class UserQuizAttempt(models.Model):
     quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='attempts')
     score = models.FloatField(default=0.0)  # Percentage score
     answers = models.JSONField(default=dict, help_text="Store user's answers as {question_id: answer_id}")
+    correct_question_ids = models.JSONField(
+        null=True, blank=True,
+        help_text="Ids of the questions answered correctly, recorded at grading time"
+    )
+    correct_count = models.PositiveIntegerField(default=0)
+    question_total = models.PositiveIntegerField(default=0)
+    passed = models.BooleanField(default=False)
     attempted_at = models.DateTimeField(auto_now_add=True)
     time_taken_minutes = models.PositiveIntegerField(default=0)
     
     class Meta:
         ordering = ['-attempted_at']
+        indexes = [
+            # Admin changelist order (newest first, ties by id) and date drill-down
+            models.Index(fields=['attempted_at', 'id'], name='attempt_attempted_at_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.quiz.title} - {self.score}%"
     
-    @property
-    def passed(self):
-        return self.score >= self.quiz.passing_score
-    
-    @property
-    def correct_count(self):
-        """Count of correct answers"""
-        return int((self.score / 100) * self.quiz.question_count)
-    
     @property
     def incorrect_count(self):
         """Count of incorrect answers"""
-        return self.quiz.question_count - self.correct_count
+        return self.question_total - self.correct_count
+
+
+def bump_quiz_version(**lookup):
+    """Invalidate cached answer keys for the quizzes matching ``lookup``"""
+    Quiz.objects.filter(**lookup).update(content_version=F('content_version') + 1)
+
+
+@receiver(pre_save, sender=Question)
+def invalidate_previous_quiz_for_question(sender, instance, **kwargs):
+    """A question moved to another quiz also changes the quiz it left"""
+    if instance.pk and not instance._state.adding:
+        bump_quiz_version(questions=instance.pk)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_quiz_for_question(sender, instance, **kwargs):
+    bump_quiz_version(pk=instance.quiz_id)
+
+
+@receiver(pre_save, sender=Answer)
+def invalidate_previous_quiz_for_answer(sender, instance, **kwargs):
+    """An answer moved to another question also changes the quiz it left"""
+    if instance.pk and not instance._state.adding:
+        bump_quiz_version(questions__answers=instance.pk)
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def invalidate_quiz_for_answer(sender, instance, **kwargs):
+    bump_quiz_version(questions=instance.question_id)
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_catalog_cache(sender, **kwargs):
+    bump_version(CATALOG)
@@ -1,3 +1,48 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from content_management.synthetic import seed_dataset
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'quiz-tests'}},
+    STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+    SECURE_SSL_REDIRECT=False,
+)
+class ChangelistQueryTests(TestCase):
+    """Changelist columns are loaded with the page, so the query count does not grow with the rows shown"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(users=12, courses=3, lessons=2, quizzes=3, questions=2, prefix='quiz-tests')
+        cls.admin = User.objects.create_superuser('quiz_admin', 'admin@example.com', 'pw')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def assert_changelist_queries(self, url_name, num, ordering=None):
+        with self.assertNumQueries(num):
+            response = self.client.get(reverse(url_name), {'o': ordering} if ordering else {})
+        self.assertEqual(response.status_code, 200)
+
+    def test_quiz_changelist(self):
+        self.assert_changelist_queries('admin:quizzes_quiz_changelist', 6)
+
+    def test_quiz_changelist_sorted_by_annotation(self):
+        # Column 3 is question_count
+        self.assert_changelist_queries('admin:quizzes_quiz_changelist', 6, ordering='3')
+
+    def test_question_changelist(self):
+        self.assert_changelist_queries('admin:quizzes_question_changelist', 6)
+
+    def test_answer_changelist(self):
+        self.assert_changelist_queries('admin:quizzes_answer_changelist', 5)
+
+    def test_user_quiz_attempt_changelist(self):
+        self.assert_changelist_queries('admin:quizzes_userquizattempt_changelist', 6)
@@ -1,15 +1,22 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# Read-heavy views have async variants for ASGI deployments
+if settings.ASYNC_VIEWS:
+    from . import async_views as read_views
+else:
+    read_views = views
+
 app_name = 'quizzes'
 
 urlpatterns = [
     # Public views
-    path('', views.quiz_list_view, name='list'),
-    path('<int:quiz_id>/', views.quiz_detail_view, name='detail'),
+    path('', read_views.quiz_list_view, name='list'),
+    path('<int:quiz_id>/', read_views.quiz_detail_view, name='detail'),
     path('<int:quiz_id>/take/', views.take_quiz_view, name='take'),
     path('<int:quiz_id>/submit/', views.take_quiz_view, name='submit'),
-    path('<int:quiz_id>/results/<int:attempt_id>/', views.quiz_results_view, name='results'),
+    path('<int:quiz_id>/results/<int:attempt_id>/', read_views.quiz_results_view, name='results'),
     
     # Quiz management (staff only)
     path('create/', views.create_quiz, name='create'),
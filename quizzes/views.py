@@ -6,14 +6,21 @@ from django.contrib import messages
 from django.utils import timezone
 from .models import Quiz, Question, Answer, UserQuizAttempt
 from .forms import QuizForm, QuestionForm, AnswerForm, AnswerFormSet
+from .grading import get_answer_key
 from courses.models import Course
+from sex_education_system.caching import cache_per_role
+from sex_education_system.pagination import keyset_paginate
+
+ATTEMPTS_PER_PAGE = (10, 25, 50)
 
 
 @login_required
+@cache_per_role('quiz_list', per_user=True)
 def quiz_list_view(request):
     """Display all active quizzes"""
-    quizzes = Quiz.objects.filter(is_active=True)
-    return render(request, 'pages/quiz_list.html', {'quizzes': quizzes})
+    quizzes = Quiz.objects.with_stats().filter(is_active=True)
+    page = keyset_paginate(request, quizzes, '-created_at')
+    return render(request, 'pages/quiz_list.html', {'quizzes': page, 'page': page})
 
 
 @login_required
@@ -23,17 +30,20 @@ def quiz_detail_view(request, quiz_id):
     questions = quiz.questions.all()
     
     # Check if user has taken this quiz
-    user_attempts = None
+    user_attempts = latest_attempt = None
     if request.user.is_authenticated:
-        user_attempts = UserQuizAttempt.objects.filter(
-            user=request.user, 
-            quiz=quiz
-        ).order_by('-attempted_at')
+        attempts = UserQuizAttempt.objects.filter(user=request.user, quiz=quiz)
+        user_attempts = keyset_paginate(request, attempts, '-attempted_at', per_page_choices=ATTEMPTS_PER_PAGE)
+        if user_attempts and not user_attempts.has_previous:
+            latest_attempt = user_attempts[0]
+        else:
+            latest_attempt = attempts.order_by('-attempted_at', '-pk').first()
     
     context = {
         'quiz': quiz,
         'questions_count': questions.count(),
         'user_attempts': user_attempts,
+        'latest_attempt': latest_attempt,
     }
     return render(request, 'pages/quiz_detail.html', context)
 
@@ -51,28 +61,19 @@ def take_quiz_view(request, quiz_id):
         return redirect('quizzes:detail', quiz_id=quiz.id)
     
     if request.method == 'POST':
-        # Process quiz submission
-        correct_count = 0
-        total_questions = questions.count()
-        user_answers = {}
-        
-        for question in questions:
-            answer_id = request.POST.get(f'question_{question.id}')
-            if answer_id:
-                user_answers[str(question.id)] = answer_id
-                answer = Answer.objects.filter(id=answer_id, question=question, is_correct=True).first()
-                if answer:
-                    correct_count += 1
-        
-        # Calculate score
-        score = round((correct_count / total_questions) * 100) if total_questions > 0 else 0
+        # Grade the submission in memory against the cached answer key
+        grade = get_answer_key(quiz).grade(request.POST)
         
         # Save attempt
         attempt = UserQuizAttempt.objects.create(
             user=request.user,
             quiz=quiz,
-            score=score,
-            answers=user_answers
+            score=grade.score,
+            answers=grade.answers,
+            correct_question_ids=grade.correct_question_ids,
+            correct_count=grade.correct_count,
+            question_total=grade.total,
+            passed=grade.score >= quiz.passing_score
         )
         
         return redirect('quizzes:results', quiz_id=quiz_id, attempt_id=attempt.id)
@@ -84,32 +85,52 @@ def take_quiz_view(request, quiz_id):
     return render(request, 'pages/take_quiz.html', context)
 
 
-@login_required
-def quiz_results_view(request, quiz_id, attempt_id):
-    """Display quiz results"""
-    quiz = get_object_or_404(Quiz, id=quiz_id)
-    attempt = get_object_or_404(UserQuizAttempt, id=attempt_id, user=request.user, quiz=quiz)
+def build_results(attempt, questions):
+    """Pair each question with the chosen and correct answers for review"""
+    answers_by_id = {
+        answer.id: answer
+        for question in questions
+        for answer in question.answers.all()
+    }
+    correct_question_ids = set(attempt.correct_question_ids or ())
     
-    # Reconstruct results for review
     results = []
-    user_answers = attempt.answers
-    
-    for question in quiz.questions.all():
-        user_answer_id = user_answers.get(str(question.id))
-        user_answer = Answer.objects.filter(id=user_answer_id).first() if user_answer_id else None
-        correct_answer = question.correct_answer
+    for question in questions:
+        user_answer_id = attempt.answers.get(str(question.id))
+        try:
+            user_answer = answers_by_id.get(int(user_answer_id)) if user_answer_id else None
+        except (TypeError, ValueError):
+            user_answer = None
+        correct_answer = next((answer for answer in question.answers.all() if answer.is_correct), None)
+        
+        if attempt.correct_question_ids is None:
+            # Attempts graded before correctness was recorded
+            is_correct = user_answer is not None and user_answer == correct_answer
+        else:
+            is_correct = question.id in correct_question_ids
         
         results.append({
             'question': question,
             'user_answer': user_answer,
             'correct_answer': correct_answer,
-            'is_correct': user_answer == correct_answer if user_answer else False
+            'is_correct': is_correct
         })
+    return results
+
+
+@login_required
+def quiz_results_view(request, quiz_id, attempt_id):
+    """Display quiz results"""
+    quiz = get_object_or_404(Quiz, id=quiz_id)
+    attempt = get_object_or_404(UserQuizAttempt, id=attempt_id, user=request.user, quiz=quiz)
+    
+    # Reconstruct results for review from one prefetched question/answer load
+    questions = list(quiz.questions.prefetch_related('answers'))
     
     context = {
         'quiz': quiz,
         'attempt': attempt,
-        'results': results,
+        'results': build_results(attempt, questions),
     }
     return render(request, 'pages/quiz_results.html', context)
 
@@ -186,8 +207,10 @@ def delete_quiz(request, quiz_id):
 def archived_quizzes_view(request):
     """List all archived quizzes (staff only)"""
     archived_quizzes = Quiz.objects.filter(is_active=False)
+    page = keyset_paginate(request, archived_quizzes, '-created_at')
     return render(request, 'pages/quiz_archive.html', {
-        'quizzes': archived_quizzes,
+        'quizzes': page,
+        'page': page,
         'title': 'Quiz Archive (Recycle Bin)'
     })
 
@@ -0,0 +1,140 @@
+"""
+Build step for the site's CSS.
+
+``manage.py build_assets`` (run by ``build.sh`` before ``collectstatic``)
+concatenates the global, atom, molecule and organism stylesheets listed in
+``CSS_BUNDLE_FILES`` into one minified ``static/dist/app.css``. The
+``CompressedManifestStaticFilesStorage`` then gives it a content hash, so
+WhiteNoise serves it with far-future cache headers and a new deploy
+changes its URL.
+
+Page-specific styles live in ``static/css/pages/`` and are linked from each
+page's ``extra_css`` block, so they are cached separately from the HTML.
+
+Fonts are self-hosted from ``static/fonts/`` when ``static/css/fonts.css``
+exists. ``build_assets --fetch-fonts`` downloads the Latin subset of the
+Google Fonts families in ``GOOGLE_FONTS_URL`` and writes that file.
+``build.sh`` runs it on every deploy and falls back to a plain build when
+Google Fonts cannot be reached; ``base.html`` then keeps linking the
+Google-hosted stylesheet. Committing the generated files would take Google
+out of the build as well.
+"""
+import posixpath
+import re
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+
+# Order matters: later files override earlier ones, as in base.html
+CSS_BUNDLE_FILES = [
+    'css/fonts.css',
+    'css/global.css',
+    'css/atoms/buttons.css',
+    'css/atoms/inputs.css',
+    'css/molecules/forms.css',
+    'css/molecules/cards.css',
+    'css/molecules/pagination.css',
+    'css/organisms/header.css',
+    'css/organisms/footer.css',
+    'css/organisms/navigation.css',
+]
+CSS_BUNDLE_OUTPUT = 'dist/app.css'
+
+GOOGLE_FONTS_URL = (
+    'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700'
+    '&family=Poppins:wght@600;700;800&display=swap'
+)
+FONT_SUBSETS = ('latin',)
+FONTS_CSS = 'css/fonts.css'
+FONTS_DIR = 'fonts'
+# Google only serves WOFF2 to browsers it recognises
+_FONT_USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+
+_COMMENT = re.compile(r'/\*(?!!).*?\*/', re.S)
+_STRING = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+_SPACE = re.compile(r'\s+')
+_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+_AFTER_COLON = re.compile(r':\s+')
+_LAST_SEMICOLON = re.compile(r';}')
+_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+_FONT_FACE = re.compile(r'/\*\s*([\w-]+)\s*\*/\s*(@font-face\s*{.*?})', re.S)
+_DECLARATION = re.compile(r'(font-family|font-style|font-weight):\s*([^;]+);')
+
+
+def static_dir():
+    return settings.STATICFILES_DIRS[0]
+
+
+def minify_css(css):
+    """Strip comments and insignificant whitespace, leaving strings untouched"""
+    css = _COMMENT.sub('', css)
+    parts = _STRING.split(css)
+    for index in range(0, len(parts), 2):
+        # Even indexes are outside quoted strings
+        chunk = _SPACE.sub(' ', parts[index])
+        chunk = _PUNCTUATION.sub(r'\1', chunk)
+        chunk = _AFTER_COLON.sub(':', chunk)
+        parts[index] = _LAST_SEMICOLON.sub('}', chunk)
+    return ''.join(parts).strip()
+
+
+def rebase_urls(css, source, output):
+    """Rewrite relative ``url()`` references in ``source`` so they resolve from ``output``"""
+    def replace(match):
+        quote, url = match.groups()
+        if url.startswith(('/', 'data:', '#')) or urlsplit(url).scheme:
+            return match.group(0)
+        target = posixpath.normpath(posixpath.join(posixpath.dirname(source), url))
+        return f'url({quote}{posixpath.relpath(target, posixpath.dirname(output))}{quote})'
+
+    return _URL.sub(replace, css)
+
+
+def build_css_bundle(files=None, output=CSS_BUNDLE_OUTPUT):
+    """Concatenate and minify ``files`` into ``output``; returns (input bytes, output bytes, files used)"""
+    root = static_dir()
+    used, chunks, original = [], [], 0
+    for name in files or CSS_BUNDLE_FILES:
+        path = root / name
+        if not path.exists():
+            continue
+        css = path.read_text(encoding='utf-8-sig')
+        original += len(css.encode())
+        chunks.append(minify_css(rebase_urls(css, name, output)))
+        used.append(name)
+    bundle = '\n'.join(chunks) + '\n'
+    target = root / output
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(bundle, encoding='utf-8')
+    return original, len(bundle.encode()), used
+
+
+def _fetch(url, timeout):
+    request = Request(url, headers={'User-Agent': _FONT_USER_AGENT})
+    with urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+
+def fetch_fonts(url=GOOGLE_FONTS_URL, subsets=FONT_SUBSETS, timeout=30):
+    """Download the requested subsets of a Google Fonts stylesheet and write ``FONTS_CSS``; returns the font files"""
+    root = static_dir()
+    stylesheet = _fetch(url, timeout).decode()
+    (root / FONTS_DIR).mkdir(parents=True, exist_ok=True)
+
+    faces, written = [], []
+    for subset, face in _FONT_FACE.findall(stylesheet):
+        if subset not in subsets:
+            continue
+        properties = dict(_DECLARATION.findall(face))
+        family = properties['font-family'].strip('\'"').lower().replace(' ', '-')
+        style = '' if properties.get('font-style', 'normal') == 'normal' else f'-{properties["font-style"]}'
+        filename = f'{family}-{properties.get("font-weight", "400")}{style}-{subset}.woff2'
+        font_url = _URL.search(face).group(2)
+        (root / FONTS_DIR / filename).write_bytes(_fetch(font_url, timeout))
+        faces.append(f'/* {subset} */\n' + _URL.sub(f"url('../{FONTS_DIR}/{filename}')", face, count=1))
+        written.append(f'{FONTS_DIR}/{filename}')
+
+    header = f'/* Self-hosted web fonts, generated by `manage.py build_assets --fetch-fonts` from\n   {url} */\n'
+    (root / FONTS_CSS).write_text(header + '\n'.join(faces) + '\n', encoding='utf-8')
+    return written
@@ -0,0 +1,195 @@
+"""
+View caching shared by the catalog pages.
+
+Cached responses are keyed by the viewer's role (anonymous, student or
+staff) because staff pages carry extra action buttons. Keys also include
+the current version of every namespace the view depends on. Writes bump
+those versions through the signal handlers in each app's models, so
+stale entries are simply never read again.
+
+Every page extends ``base.html``, whose header shows the signed-in
+user's name, so views rendered for authenticated users must be cached
+with ``per_user=True``; a role-wide entry would serve one user's header
+to everybody else with that role.
+
+Hit and miss counters live in the cache as well, so they are shared by
+all workers when a shared backend is configured.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .instrumentation import record_cache_lookup
+
+# Namespace bumped on any Course, Lesson, Quiz or Question write
+CATALOG = 'catalog'
+
+_registered_views = []
+
+
+def user_role(user):
+    if not user.is_authenticated:
+        return 'anonymous'
+    return 'staff' if user.is_staff else 'student'
+
+
+def user_namespace(user_id):
+    """Namespace bumped when a user's own progress changes"""
+    return f'user:{user_id}'
+
+
+def _version_key(namespace):
+    return f'cache-version:{namespace}'
+
+
+def get_version(namespace):
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_version(namespace):
+    key = _version_key(namespace)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_version(namespace):
+    """Invalidate every cached view that depends on ``namespace``"""
+    # A fresh timestamp never collides with a version that was evicted earlier
+    cache.set(_version_key(namespace), time.time_ns(), None)
+
+
+def _stats_key(name, outcome):
+    return f'view-cache-stats:{name}:{outcome}'
+
+
+def _count(name, outcome):
+    record_cache_lookup(outcome == 'hit')
+    key = _stats_key(name, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+async def _acount(name, outcome):
+    record_cache_lookup(outcome == 'hit')
+    key = _stats_key(name, outcome)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aset(key, 1, None)
+
+
+def view_cache_stats():
+    """Hit/miss counters for every cached view"""
+    stats = []
+    for name in _registered_views:
+        counts = cache.get_many([_stats_key(name, 'hit'), _stats_key(name, 'miss')])
+        hits = counts.get(_stats_key(name, 'hit'), 0)
+        misses = counts.get(_stats_key(name, 'miss'), 0)
+        total = hits + misses
+        stats.append({
+            'name': name,
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total * 100, 1) if total else 0,
+        })
+    return stats
+
+
+def _view_key(name, request, user, versions, per_user):
+    owner = str(user.pk) if per_user and user.is_authenticated else ''
+    path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'view:{name}:{user_role(user)}:{owner}:{versions}:{path_hash}'
+
+
+def _cacheable(request, response):
+    # Pages that issued a CSRF token or set cookies are user-specific
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+    )
+
+
+def cache_per_role(name, depends_on=(CATALOG,), per_user=False, timeout=None):
+    """
+    Cache GET responses of a view per user role.
+
+    ``depends_on`` lists the version namespaces whose bump invalidates the
+    page. With ``per_user`` the entry is private to the user and also
+    depends on the user's own namespace. Both sync and async views are
+    supported.
+    """
+    if name not in _registered_views:
+        _registered_views.append(name)
+
+    def namespaces_for(user):
+        namespaces = list(depends_on)
+        if per_user and user.is_authenticated:
+            namespaces.append(user_namespace(user.pk))
+        return namespaces
+
+    def response_timeout():
+        return settings.VIEW_CACHE_TIMEOUT if timeout is None else timeout
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view_func(request, *args, **kwargs)
+
+                user = await request.auser()
+                versions = '.'.join([str(await aget_version(namespace)) for namespace in namespaces_for(user)])
+                key = _view_key(name, request, user, versions, per_user)
+
+                cached = await cache.aget(key)
+                if cached is not None:
+                    await _acount(name, 'hit')
+                    content, content_type = cached
+                    return HttpResponse(content, content_type=content_type)
+
+                await _acount(name, 'miss')
+                response = await view_func(request, *args, **kwargs)
+                if _cacheable(request, response):
+                    await cache.aset(key, (response.content, response['Content-Type']), response_timeout())
+                return response
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            user = request.user
+            versions = '.'.join(str(get_version(namespace)) for namespace in namespaces_for(user))
+            key = _view_key(name, request, user, versions, per_user)
+
+            cached = cache.get(key)
+            if cached is not None:
+                _count(name, 'hit')
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+
+            _count(name, 'miss')
+            response = view_func(request, *args, **kwargs)
+            if _cacheable(request, response):
+                cache.set(key, (response.content, response['Content-Type']), response_timeout())
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,30 @@
+from django.conf import settings
+
+from .caching import user_role
+
+# Navigation links and the path test that marks each one active
+NAV_SECTIONS = [
+    ('home', lambda path: path == '/'),
+    ('courses', lambda path: 'courses' in path),
+    ('quizzes', lambda path: 'quizzes' in path),
+    ('dashboard', lambda path: 'dashboard' in path),
+    ('content_management', lambda path: 'content_management' in path),
+]
+
+
+def assets(request):
+    """Expose how stylesheets and fonts are served to base.html"""
+    return {
+        'css_bundle': settings.CSS_BUNDLE,
+        'self_hosted_fonts': settings.SELF_HOSTED_FONTS,
+    }
+
+
+def layout(request):
+    """Everything the cached header, navigation and footer fragments vary on"""
+    return {
+        'user_role': user_role(request.user),
+        'nav_active': [name for name, matches in NAV_SECTIONS if matches(request.path)],
+        'layout_cache_timeout': settings.LAYOUT_CACHE_TIMEOUT,
+        'layout_version': settings.LAYOUT_CACHE_VERSION,
+    }
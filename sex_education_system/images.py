@@ -0,0 +1,151 @@
+"""
+Responsive image derivatives for uploaded images.
+
+When a course image or profile picture is uploaded, the original is
+re-encoded without its EXIF metadata. Resized copies are then written at
+a few widths, in WebP and in a JPEG (or PNG, for images with
+transparency) fallback. The result is stored on the model as JSON::
+
+    {"source": "courses/cover.jpg", "width": 2400, "height": 1600,
+     "variants": [{"width": 320, "height": 213,
+                   "webp": "courses/variants/cover-320w.webp",
+                   "fallback": "courses/variants/cover-320w.jpg"}, ...]}
+
+The ``responsive_image`` template tag turns this into ``srcset``/``sizes``
+markup. ``source`` records which upload the variants belong to, so a
+replaced image is detected without another query.
+
+Decoding and resizing take far longer than a request should, so the save
+signals only call ``schedule_refresh_variants``: once the transaction
+commits, the work runs on a background thread and the page shows the
+original upload until the variants exist. Jobs lost to a restart are
+picked up by ``manage.py build_image_variants``.
+"""
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Target widths (in CSS pixels times the common device pixel ratios) per use
+COURSE_IMAGE_WIDTHS = (320, 480, 720, 1080)
+AVATAR_WIDTHS = (96, 192, 384)
+
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+logger = logging.getLogger(__name__)
+
+# One worker: uploads are rare, and this bounds the memory spent on decoded images
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-variants')
+
+
+def _encode(image, fmt):
+    buffer = BytesIO()
+    if fmt == 'WEBP':
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+    elif fmt == 'JPEG':
+        image.convert('RGB').save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    else:
+        image.save(buffer, fmt, optimize=True)
+    return buffer.getvalue()
+
+
+def _has_alpha(image):
+    return image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+
+
+def build_variants(field_file, widths):
+    """Strip metadata from ``field_file``, write its resized variants and return their description"""
+    storage = field_file.storage
+    try:
+        with storage.open(field_file.name, 'rb') as source:
+            original = Image.open(source)
+            original_format = original.format
+            # Apply the camera rotation before the EXIF block is dropped
+            image = ImageOps.exif_transpose(original)
+            image.load()
+    except (OSError, UnidentifiedImageError):
+        # Remember the unreadable upload so it is not retried on every save
+        return {'source': field_file.name, 'variants': []}
+
+    alpha = _has_alpha(image)
+    image = image.convert('RGBA' if alpha else 'RGB')
+
+    # Re-encode the upload itself so location and device metadata are not served
+    if original_format in ('JPEG', 'PNG', 'WEBP') and (original.info.get('exif') or original.getexif()):
+        storage.delete(field_file.name)
+        storage.save(field_file.name, ContentFile(_encode(image, original_format)))
+
+    directory, filename = posixpath.split(field_file.name)
+    stem = posixpath.splitext(filename)[0]
+    fallback_format, fallback_ext = ('PNG', 'png') if alpha else ('JPEG', 'jpg')
+
+    variants = []
+    # Never upscale: widths beyond the original collapse into one full-size variant
+    targets = sorted({min(width, image.width) for width in widths})
+    for width in targets:
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        base = posixpath.join(directory, 'variants', f'{stem}-{width}w')
+        variants.append({
+            'width': width,
+            'height': height,
+            'webp': storage.save(f'{base}.webp', ContentFile(_encode(resized, 'WEBP'))),
+            'fallback': storage.save(f'{base}.{fallback_ext}', ContentFile(_encode(resized, fallback_format))),
+        })
+
+    return {
+        'source': field_file.name,
+        'width': image.width,
+        'height': image.height,
+        'variants': variants,
+    }
+
+
+def delete_variants(storage, info):
+    """Remove the files listed in a variants description"""
+    for variant in (info or {}).get('variants', []):
+        for key in ('webp', 'fallback'):
+            if variant.get(key):
+                storage.delete(variant[key])
+
+
+def refresh_variants(instance, field_name, variants_field, widths):
+    """Rebuild the variants of ``instance.<field_name>`` if the upload changed; returns True when updated"""
+    field_file = getattr(instance, field_name)
+    current = getattr(instance, variants_field) or {}
+    name = field_file.name if field_file else ''
+    if current.get('source', '') == name:
+        return False
+
+    delete_variants(field_file.storage, current)
+    info = build_variants(field_file, widths) if name else {}
+    setattr(instance, variants_field, info)
+    type(instance)._default_manager.filter(pk=instance.pk).update(**{variants_field: info})
+    return True
+
+
+def _refresh_in_background(model, pk, field_name, variants_field, widths, on_update):
+    try:
+        instance = model._default_manager.filter(pk=pk).only('pk', field_name, variants_field).first()
+        if instance is not None and refresh_variants(instance, field_name, variants_field, widths) and on_update:
+            on_update()
+    except Exception:
+        logger.exception('Could not build %s variants for %s #%s', field_name, model.__name__, pk)
+    finally:
+        # The worker thread has its own connection; do not leave it open between uploads
+        connection.close()
+
+
+def schedule_refresh_variants(instance, field_name, variants_field, widths, on_update=None):
+    """Run ``refresh_variants`` off the request once the transaction commits, if the upload changed"""
+    field_file = getattr(instance, field_name)
+    name = field_file.name if field_file else ''
+    if (getattr(instance, variants_field) or {}).get('source', '') == name:
+        return
+    args = (type(instance), instance.pk, field_name, variants_field, widths, on_update)
+    transaction.on_commit(lambda: _executor.submit(_refresh_in_background, *args))
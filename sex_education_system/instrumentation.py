@@ -0,0 +1,291 @@
+"""
+Per-request performance instrumentation.
+
+PerformanceMiddleware measures every request: SQL query count and time,
+template render time, cache hits and misses, and total time spent in the
+view. The numbers are always folded into per-URL-name histograms, which
+the staff-only metrics view exposes in Prometheus text format. Staff also
+get them in a ``Server-Timing`` header, so they show up in the browser's
+network panel; everyone else only with ``SERVER_TIMING_PUBLIC`` (on in
+DEBUG).
+
+Measurements for the current request live in a context variable. Queries
+and template renders are attributed through process-wide hooks that do
+nothing outside an instrumented request. The context is copied into
+sync_to_async threads, so async views are measured as well. Histograms are
+kept per process; scrape every worker, or aggregate in Prometheus.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.base import Template
+
+_current = ContextVar('request_metrics', default=None)
+
+# Upper bounds of the histogram buckets, in seconds (time) and queries (count)
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+class RequestMetrics:
+    """Measurements collected while one request is being handled"""
+    __slots__ = ('queries', 'sql_time', 'template_time', 'template_depth', 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+def record_cache_lookup(hit):
+    """Count a cache hit or miss against the current request, if any"""
+    metrics = _current.get()
+    if metrics is not None:
+        if hit:
+            metrics.cache_hits += 1
+        else:
+            metrics.cache_misses += 1
+
+
+def _sql_wrapper(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.sql_time += time.perf_counter() - started
+
+
+def _add_sql_wrapper(connection, **kwargs):
+    if _sql_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_sql_wrapper)
+
+
+_original_render = Template.render
+
+
+def _timed_render(self, context):
+    metrics = _current.get()
+    if metrics is None:
+        return _original_render(self, context)
+    # Only the outermost render is timed; includes and nested renders run inside it
+    metrics.template_depth += 1
+    started = time.perf_counter()
+    try:
+        return _original_render(self, context)
+    finally:
+        metrics.template_depth -= 1
+        if metrics.template_depth == 0:
+            metrics.template_time += time.perf_counter() - started
+
+
+_installed = False
+
+
+def install():
+    """Hook SQL execution and template rendering; safe to call more than once.
+
+    Runs when the middleware chain is built at startup, so every connection
+    opened afterwards, in any thread, gets the SQL wrapper.
+    """
+    global _installed
+    if _installed:
+        return
+    connection_created.connect(_add_sql_wrapper, dispatch_uid='instrumentation_sql_wrapper')
+    for connection in connections.all(initialized_only=True):
+        _add_sql_wrapper(connection)
+    Template.render = _timed_render
+    _installed = True
+
+
+@contextmanager
+def collect():
+    """Measure the queries and template renders made inside the block.
+
+    Yields the RequestMetrics they are counted in. A block nested inside
+    another adds to the enclosing measurements, so a caller timing a whole
+    request (the view benchmark) still sees what ran under the middleware.
+    """
+    metrics = _current.get()
+    if metrics is not None:
+        yield metrics
+        return
+    install()
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the shape Prometheus expects"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """Per-URL-name histograms and cache counters for this process"""
+
+    HISTOGRAMS = {
+        'request_duration_seconds': ('Time spent handling the request', TIME_BUCKETS),
+        'db_query_duration_seconds': ('Time spent executing SQL per request', TIME_BUCKETS),
+        'db_queries': ('SQL queries executed per request', QUERY_BUCKETS),
+        'template_render_seconds': ('Time spent rendering templates per request', TIME_BUCKETS),
+    }
+    COUNTERS = {
+        'cache_hits_total': 'Cache lookups that were served from the cache',
+        'cache_misses_total': 'Cache lookups that had to be rebuilt',
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def observe(self, view, duration, metrics):
+        values = {
+            'request_duration_seconds': duration,
+            'db_query_duration_seconds': metrics.sql_time,
+            'db_queries': metrics.queries,
+            'template_render_seconds': metrics.template_time,
+        }
+        with self._lock:
+            for name, value in values.items():
+                histogram = self._histograms.get((name, view))
+                if histogram is None:
+                    histogram = self._histograms[(name, view)] = Histogram(self.HISTOGRAMS[name][1])
+                histogram.observe(value)
+            for name, value in (('cache_hits_total', metrics.cache_hits), ('cache_misses_total', metrics.cache_misses)):
+                self._counters[(name, view)] = self._counters.get((name, view), 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self, prefix='app'):
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, (description, buckets) in self.HISTOGRAMS.items():
+                metric = f'{prefix}_{name}'
+                lines.append(f'# HELP {metric} {description}')
+                lines.append(f'# TYPE {metric} histogram')
+                for (histogram_name, view), histogram in sorted(self._histograms.items()):
+                    if histogram_name != name:
+                        continue
+                    label = _escape(view)
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{metric}_bucket{{view="{label}",le="{bound}"}} {count}')
+                    lines.append(f'{metric}_bucket{{view="{label}",le="+Inf"}} {histogram.total}')
+                    lines.append(f'{metric}_sum{{view="{label}"}} {histogram.sum:.6f}')
+                    lines.append(f'{metric}_count{{view="{label}"}} {histogram.total}')
+            for name, description in self.COUNTERS.items():
+                metric = f'{prefix}_{name}'
+                lines.append(f'# HELP {metric} {description}')
+                lines.append(f'# TYPE {metric} counter')
+                for (counter_name, view), value in sorted(self._counters.items()):
+                    if counter_name == name:
+                        lines.append(f'{metric}{{view="{_escape(view)}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
+
+
+def server_timing(metrics, duration):
+    """Format request measurements as a Server-Timing header value"""
+    return ', '.join([
+        f'db;dur={metrics.sql_time * 1000:.1f};desc="{metrics.queries} queries"',
+        f'tpl;dur={metrics.template_time * 1000:.1f}',
+        f'cache;desc="{metrics.cache_hits} hits, {metrics.cache_misses} misses"',
+        f'view;dur={duration * 1000:.1f}',
+    ])
+
+
+def _is_staff(request):
+    # Static files are answered before AuthenticationMiddleware sets request.user
+    user = getattr(request, 'user', None)
+    return user is not None and user.is_staff
+
+
+async def _ais_staff(request):
+    # request.user would load the user synchronously inside the event loop
+    if not hasattr(request, 'auser'):
+        return False
+    return (await request.auser()).is_staff
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None else '<unresolved>'
+
+
+class PerformanceMiddleware:
+    """Measure each request for the metrics registry and, where allowed, Server-Timing"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = settings.INSTRUMENTATION_ENABLED
+        self.public = settings.SERVER_TIMING_PUBLIC
+        if self.enabled:
+            install()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        started = time.perf_counter()
+        with collect() as metrics:
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+        return self.finish(request, response, metrics, duration, self.public or _is_staff(request))
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        started = time.perf_counter()
+        with collect() as metrics:
+            response = await self.get_response(request)
+        duration = time.perf_counter() - started
+        return self.finish(request, response, metrics, duration, self.public or await _ais_staff(request))
+
+    def finish(self, request, response, metrics, duration, send_timing):
+        registry.observe(_view_name(request), duration, metrics)
+        if send_timing:
+            response['Server-Timing'] = server_timing(metrics, duration)
+        return response
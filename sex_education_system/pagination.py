@@ -0,0 +1,144 @@
+"""
+Keyset (cursor) pagination for the list pages.
+
+``OFFSET n`` makes the database walk and discard ``n`` rows, and a page
+count needs a ``COUNT(*)`` over the whole result, so both grow with the
+table and with how deep a visitor pages. A keyset page instead filters on
+the ordering column of the last (or first) row already shown, with the
+primary key as tie-breaker::
+
+    WHERE (created_at, id) < (<cursor>) ORDER BY created_at DESC, id DESC LIMIT n + 1
+
+With an index on ``(created_at, id)`` every page costs the same. The extra
+row only tells whether another page exists. There are no page numbers;
+``molecules/pagination.html`` renders previous/next links (``rel=prev`` /
+``rel=next``) and the page-size choice.
+
+Cursors are opaque url-safe strings carried in the ``after`` or ``before``
+query parameter; ``per_page`` picks one of the offered page sizes.
+"""
+import base64
+import datetime
+
+from django.db.models import Q
+from django.http import Http404
+
+PER_PAGE_CHOICES = (12, 24, 48)
+
+
+def _encode_cursor(value, pk):
+    raw = f'{value.isoformat()}|{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        value, pk = raw.rsplit('|', 1)
+        return datetime.datetime.fromisoformat(value), int(pk)
+    except ValueError:
+        raise Http404('Invalid page cursor')
+
+
+class KeysetPage:
+    """One page of rows plus the cursors needed to link its neighbours"""
+
+    def __init__(self, request, object_list, per_page, per_page_choices, ordering,
+                 has_next, has_previous):
+        self.request = request
+        self.object_list = object_list
+        self.per_page = per_page
+        self.per_page_choices = per_page_choices
+        self.ordering = ordering
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def _cursor(self, obj):
+        return _encode_cursor(getattr(obj, self.ordering.lstrip('-')), obj.pk)
+
+    def _query_string(self, **params):
+        query = self.request.GET.copy()
+        for key in ('after', 'before', 'per_page'):
+            query.pop(key, None)
+        query.update({key: value for key, value in params.items() if value is not None})
+        return '?' + query.urlencode()
+
+    def next_url(self):
+        if self.has_next:
+            return self._query_string(after=self._cursor(self.object_list[-1]), per_page=self.per_page)
+        return None
+
+    def previous_url(self):
+        if self.has_previous:
+            return self._query_string(before=self._cursor(self.object_list[0]), per_page=self.per_page)
+        return None
+
+    def hidden_params(self):
+        """Query parameters other than paging, kept by the page-size form"""
+        return [
+            (key, value)
+            for key, values in self.request.GET.lists() if key not in ('after', 'before', 'per_page')
+            for value in values
+        ]
+
+
+def keyset_paginate(request, queryset, ordering, per_page_choices=PER_PAGE_CHOICES):
+    """
+    Return the ``KeysetPage`` of ``queryset`` requested by ``request``.
+
+    ``ordering`` is the datetime field the list is sorted on, prefixed with
+    ``-`` for newest first; the primary key breaks ties in the same
+    direction. A malformed cursor raises Http404, an unknown ``per_page``
+    falls back to the first choice.
+    """
+    field = ordering.lstrip('-')
+    descending = ordering.startswith('-')
+    try:
+        per_page = int(request.GET.get('per_page', ''))
+    except ValueError:
+        per_page = per_page_choices[0]
+    if per_page not in per_page_choices:
+        per_page = per_page_choices[0]
+
+    after, before = request.GET.get('after'), request.GET.get('before')
+    cursor = after or before
+    # Reading backwards (the "previous" link) walks the index in the opposite direction
+    backwards = bool(before) and not after
+    forward_order = [f'-{field}', '-pk'] if descending else [field, 'pk']
+    order = [key[1:] if key.startswith('-') else f'-{key}' for key in forward_order] if backwards else forward_order
+
+    if cursor:
+        value, pk = _decode_cursor(cursor)
+        lookup = 'lt' if descending != backwards else 'gt'
+        # The leading inclusive bound lets the database range-scan the index; the OR
+        # then only resolves rows that share the cursor's timestamp
+        queryset = queryset.filter(
+            Q(**{f'{field}__{lookup}e': value}),
+            Q(**{f'{field}__{lookup}': value}) | Q(**{f'pk__{lookup}': pk}),
+        )
+
+    rows = list(queryset.order_by(*order)[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, bool(after)
+    return KeysetPage(request, rows, per_page, per_page_choices, ordering, has_next, has_previous)
@@ -52,6 +52,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'sex_education_system.instrumentation.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Add WhiteNoise
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -68,19 +69,35 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compile each template once per process; the dev server's
+            # autoreloader still resets this when a template changes
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'sex_education_system.context_processors.assets',
+                'sex_education_system.context_processors.layout',
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'sex_education_system.wsgi.application'
+ASGI_APPLICATION = 'sex_education_system.asgi.application'
+
+# Route the read-heavy views to their async variants (serve through ASGI).
+# Off in production: WhiteNoiseMiddleware is sync-only, so ASGI adapts every
+# request into a thread, and the async ORM funnels queries through a single
+# sync thread as well; gunicorn on WSGI serves these pages faster.
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', 'False') == 'True'
 
 
 # Database
@@ -105,6 +122,61 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+
+# CACHE_BACKEND selects locmem (default, per process), file, or redis. The redis
+# backend speaks the Redis protocol, so any compatible server can stand in locally.
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'sex-education-system'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / '.django_cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': os.environ.get('CACHE_LOCATION', CACHE_BACKENDS[CACHE_BACKEND][1]),
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', 300)),
+        'KEY_PREFIX': 'sex-education',
+    }
+}
+
+# Seconds a cached catalog page is served before it is rebuilt
+VIEW_CACHE_TIMEOUT = int(os.environ.get('VIEW_CACHE_TIMEOUT', 300))
+
+# Header, navigation and footer fragments are cached per role (the header
+# per username); the version keeps a deploy from serving the old markup
+LAYOUT_CACHE_TIMEOUT = int(os.environ.get('LAYOUT_CACHE_TIMEOUT', 3600))
+LAYOUT_CACHE_VERSION = os.environ.get('RENDER_GIT_COMMIT', '')
+
+
+# Per-view histograms served at /metrics, plus per-request Server-Timing headers.
+# Prometheus can scrape with "Authorization: Bearer <METRICS_TOKEN>" instead of a staff session.
+INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', 'True') == 'True'
+# Server-Timing is sent to staff; to every visitor only when this is on (DEBUG by default),
+# since query counts and timings tell an outsider too much about the backend
+SERVER_TIMING_PUBLIC = os.environ.get('SERVER_TIMING_PUBLIC', str(DEBUG)) == 'True'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+
+# Lesson video availability checks (courses.video_probe, `manage.py videos probe`)
+VIDEO_PROBE_BACKEND = os.environ.get('VIDEO_PROBE_BACKEND', 'courses.video_probe.OEmbedProbe')
+VIDEO_OEMBED_ENDPOINTS = {
+    'youtube': os.environ.get('VIDEO_OEMBED_YOUTUBE', 'https://www.youtube.com/oembed'),
+    'vimeo': os.environ.get('VIDEO_OEMBED_VIMEO', 'https://vimeo.com/api/oembed.json'),
+}
+VIDEO_PROBE_TIMEOUT = float(os.environ.get('VIDEO_PROBE_TIMEOUT', 5))
+VIDEO_PROBE_WORKERS = int(os.environ.get('VIDEO_PROBE_WORKERS', 8))
+VIDEO_STATUS_TTL = int(os.environ.get('VIDEO_STATUS_TTL', 60 * 60 * 24))
+
+
+# Content management dashboard statistics snapshots
+PLATFORM_STATS_MAX_AGE = int(os.environ.get('PLATFORM_STATS_MAX_AGE', 900))
+PLATFORM_STATS_USE_ESTIMATES = os.environ.get('PLATFORM_STATS_USE_ESTIMATES', 'True') == 'True'
+PLATFORM_STATS_ESTIMATE_THRESHOLD = int(os.environ.get('PLATFORM_STATS_ESTIMATE_THRESHOLD', 1000000))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -143,6 +215,12 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Link the minified bundle written by `manage.py build_assets` (see build.sh)
+# instead of the individual stylesheets
+CSS_BUNDLE = os.environ.get('CSS_BUNDLE', str(not DEBUG)) == 'True'
+# Serve the fonts from static/fonts once `build_assets --fetch-fonts` has run (build.sh does)
+SELF_HOSTED_FONTS = (BASE_DIR / 'static' / 'css' / 'fonts.css').exists()
+
 # Storage configuration for static and media files
 STORAGES = {
     "default": {
@@ -165,6 +243,21 @@ LOGIN_URL = 'accounts:login'
 LOGIN_REDIRECT_URL = 'accounts:dashboard'
 LOGOUT_REDIRECT_URL = 'home'
 
+# Sessions and flash messages
+# SESSION_STORE picks db, cached_db (read from the cache, written through to
+# the database) or cache (no database at all; sessions are lost on eviction).
+# cached_db needs a cache shared by every worker, otherwise a logout in one
+# worker leaves the session alive in the others' local caches.
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+}
+SESSION_STORE = os.environ.get('SESSION_STORE', 'db' if CACHE_BACKEND == 'locmem' else 'cached_db')
+SESSION_ENGINE = SESSION_ENGINES[SESSION_STORE]
+# Flash messages travel in a signed cookie and never touch the session
+MESSAGE_STORAGE = os.environ.get('MESSAGE_STORAGE', 'django.contrib.messages.storage.cookie.CookieStorage')
+
 # Security Settings (only enable in production)
 if not DEBUG:
     SECURE_SSL_REDIRECT = True
@@ -6,6 +6,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import TemplateView
+from content_management.views import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -14,6 +15,7 @@ urlpatterns = [
     path('courses/', include('courses.urls')),
     path('quizzes/', include('quizzes.urls')),
     path('content-management/', include('content_management.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 # Serve media files in development